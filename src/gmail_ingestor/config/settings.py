@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -25,6 +26,9 @@ class GmailIngestorSettings(BaseSettings):
     label: str = "INBOX"
     max_results_per_page: int = 100
     batch_size: int = 50
+    # "raw" fetches the whole RFC 822 message in one blob (parsed natively when
+    # the fast extra is installed); "full" fetches Gmail's pre-split MIME tree
+    message_format: Literal["full", "raw"] = "full"
 
     # Output paths
     output_markdown_dir: Path = Path("output/markdown")
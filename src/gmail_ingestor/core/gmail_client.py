@@ -3,9 +3,13 @@
 from __future__ import annotations
 
 import logging
+import queue
 import random
+import re
+import threading
 import time
-from collections.abc import Generator
+from collections.abc import Callable, Generator
+from functools import cached_property
 from typing import Any
 
 from googleapiclient.discovery import Resource
@@ -17,13 +21,67 @@ from gmail_ingestor.core.models import MessageStub
 
 logger = logging.getLogger(__name__)
 
+# Matches 429 status codes and the Gmail quota reasons (rateLimitExceeded,
+# userRateLimitExceeded, quotaExceeded) in a single scan of the error text.
+_RATE_RE = re.compile(r"429|rateLimitExceeded|userRateLimitExceeded|quotaExceeded")
+
+# Adaptive batch sizing (AIMD): Gmail caps a batch at 100 requests. Halve the
+# size on a 429, and grow it back by a fixed step after a run of clean chunks.
+_MAX_BATCH_SIZE = 100
+_MIN_BATCH_SIZE = 10
+_BATCH_SIZE_STEP = 10
+_BATCH_RECOVERY_CHUNKS = 3
+
 
 def _is_rate_limit_error(exc: Exception) -> bool:
     """Check whether an exception represents a Gmail API 429 rate limit."""
-    if isinstance(exc, HttpError) and exc.status_code == 429:
-        return True
-    error_str = str(exc)
-    return "429" in error_str or "rateLimitExceeded" in error_str
+    if isinstance(exc, HttpError):
+        status = getattr(exc.resp, "status", None)
+        if status == 429:
+            return True
+        # Gmail reports per-user quota exhaustion as 403 with a rate-limit reason;
+        # any other status is decided without formatting the (expensive) HttpError str.
+        if status != 403:
+            return False
+        return _RATE_RE.search(str(exc)) is not None
+    args = exc.args
+    msg = args[0] if args and isinstance(args[0], str) else str(exc)
+    return _RATE_RE.search(msg) is not None
+
+
+class _BatchState:
+    """Per-chunk state shared between batch attempts and the batch callback."""
+
+    __slots__ = ("index", "results", "pending", "errors", "rate_limited")
+
+    def __init__(self, message_ids: list[str]) -> None:
+        # Pre-sized and filled by position, so output keeps input order
+        self.index = {mid: i for i, mid in enumerate(message_ids)}
+        self.results: list[dict[str, Any] | None] = [None] * len(message_ids)
+        self.pending: set[str] = set(message_ids)
+        self.errors: list[str] = []
+        self.rate_limited = False
+
+    def callback(
+        self,
+        request_id: str,
+        response: dict[str, Any] | None,
+        exception: Exception | None,
+    ) -> None:
+        """BatchHttpRequest callback; request_id is the Gmail message ID."""
+        if exception:
+            if _is_rate_limit_error(exception):
+                # Leave request_id in pending so it is retried
+                self.rate_limited = True
+            else:
+                logger.warning("Batch fetch error for %s: %s", request_id, exception)
+                self.errors.append(f"Error for {request_id}: {exception}")
+                self.pending.discard(request_id)
+        elif response:
+            self.results[self.index[request_id]] = response
+            self.pending.discard(request_id)
+        else:
+            self.pending.discard(request_id)
 
 
 class GmailClient:
@@ -39,14 +97,51 @@ class GmailClient:
         max_backoff_seconds: float = 60.0,
         inter_page_delay_seconds: float = 0.2,
         num_retries: int = 3,
+        message_format: str = "full",
+        service_factory: Callable[[], Resource] | None = None,
     ) -> None:
         self._service = service
+        # Builds an extra service (with its own HTTP transport) for the
+        # stream_messages discovery thread; httplib2 is not thread-safe
+        self._service_factory = service_factory
         self._user_id = user_id
         self._max_retries = max_retries
-        self._initial_backoff = initial_backoff_seconds
-        self._max_backoff = max_backoff_seconds
+        # Backoff cap for each retry attempt: initial * 2**attempt, capped at max
+        self._backoff_schedule = tuple(
+            min(max_backoff_seconds, initial_backoff_seconds * (2**i))
+            for i in range(max_retries)
+        )
         self._inter_page_delay = inter_page_delay_seconds
         self._num_retries = num_retries
+        self._message_format = message_format
+        # Per-client RNG so concurrent retries don't contend on the global Random
+        self._rng = random.Random()
+        self._current_batch_size = _MAX_BATCH_SIZE
+        self._clean_chunks = 0
+
+    # Resource wrappers are built on first use and then reused; each
+    # .users().messages() chain walks the discovery document and constructs
+    # fresh Resource objects.
+
+    @cached_property
+    def _users(self) -> Any:
+        return self._service.users()
+
+    @cached_property
+    def _messages(self) -> Any:
+        return self._users.messages()
+
+    @cached_property
+    def _labels(self) -> Any:
+        return self._users.labels()
+
+    @cached_property
+    def _history(self) -> Any:
+        return self._users.history()
+
+    @cached_property
+    def _batch_factory(self) -> Any:
+        return self._service.new_batch_http_request
 
     def _execute_with_retry(self, request: Any, context: str) -> Any:
         """Execute a single API request with exponential backoff on 429 errors.
@@ -62,11 +157,14 @@ class GmailClient:
             RateLimitError: When retries are exhausted on 429 errors.
             GmailIngestorError: On non-rate-limit API errors.
         """
-        backoff = self._initial_backoff
+        # BatchHttpRequest.execute() has no built-in retry, so don't pass num_retries
+        execute_kwargs: dict[str, Any] = (
+            {} if isinstance(request, BatchHttpRequest) else {"num_retries": self._num_retries}
+        )
 
         for attempt in range(self._max_retries + 1):
             try:
-                return request.execute(num_retries=self._num_retries)
+                return request.execute(**execute_kwargs)
             except Exception as e:
                 if _is_rate_limit_error(e):
                     if attempt >= self._max_retries:
@@ -74,8 +172,8 @@ class GmailClient:
                             f"Rate limited during {context} after "
                             f"{self._max_retries} retries: {e}"
                         ) from e
-                    sleep_time = min(backoff, self._max_backoff)
-                    jitter = random.uniform(0, sleep_time)
+                    backoff = self._backoff_schedule[attempt]
+                    jitter = self._rng.uniform(0, backoff)
                     logger.warning(
                         "Rate limited during %s (attempt %d/%d), "
                         "sleeping %.2fs (backoff=%.2f + jitter=%.2f)",
@@ -83,7 +181,6 @@ class GmailClient:
                         jitter, backoff, jitter,
                     )
                     time.sleep(jitter)
-                    backoff = min(backoff * 2, self._max_backoff)
                 else:
                     raise GmailIngestorError(
                         f"Failed to {context}: {e}"
@@ -98,7 +195,7 @@ class GmailClient:
         Returns:
             List of dicts with 'id' and 'name' keys.
         """
-        request = self._service.users().labels().list(userId=self._user_id)
+        request = self._labels.list(userId=self._user_id)
         results = self._execute_with_retry(request, "list labels")
         labels = results.get("labels", [])
         return [{"id": lbl["id"], "name": lbl["name"]} for lbl in labels]
@@ -121,38 +218,66 @@ class GmailClient:
         Yields:
             Lists of MessageStub objects, one list per API page.
         """
+        yield from self._iter_message_pages(self._messages, label_id, max_results_per_page, query)
+
+    def _iter_message_pages(
+        self,
+        messages_resource: Any,
+        label_id: str,
+        max_results_per_page: int,
+        query: str | None,
+        stop: threading.Event | None = None,
+    ) -> Generator[list[MessageStub], None, None]:
+        """Body of discover_message_ids over a given messages() resource.
+
+        Args:
+            messages_resource: The users().messages() resource issuing list requests.
+            label_id: Gmail label ID to filter by.
+            max_results_per_page: Number of messages per page (1-500).
+            query: Optional Gmail search query to further filter.
+            stop: When set, no further page is requested.
+
+        Yields:
+            Lists of MessageStub objects, one list per API page.
+        """
+        base_kwargs: dict[str, Any] = {
+            "userId": self._user_id,
+            "labelIds": [label_id],
+            "maxResults": max_results_per_page,
+        }
+        if query:
+            base_kwargs["q"] = query
+
         page_token: str | None = None
-        first_page = True
+        next_allowed: float | None = None
 
         while True:
-            if not first_page and self._inter_page_delay > 0:
-                time.sleep(self._inter_page_delay)
-            first_page = False
-
-            kwargs: dict[str, Any] = {
-                "userId": self._user_id,
-                "labelIds": [label_id],
-                "maxResults": max_results_per_page,
-            }
-            if page_token:
-                kwargs["pageToken"] = page_token
-            if query:
-                kwargs["q"] = query
-
-            request = self._service.users().messages().list(**kwargs)
-            response = self._execute_with_retry(request, "discover messages")
+            if next_allowed is not None:
+                remaining = next_allowed - time.monotonic()
+                if remaining > 0:
+                    time.sleep(remaining)
 
-            messages = response.get("messages", [])
-            if not messages:
+            if stop is not None and stop.is_set():
                 return
 
-            stubs = [
-                MessageStub(message_id=msg["id"], thread_id=msg["threadId"]) for msg in messages
-            ]
-            logger.debug("Discovered %d message IDs (page)", len(stubs))
-            yield stubs
+            kwargs = {**base_kwargs, "pageToken": page_token} if page_token else base_kwargs
+            request = messages_resource.list(**kwargs)
+            response = self._execute_with_retry(request, "discover messages")
 
             page_token = response.get("nextPageToken")
+
+            # Start the inter-page delay now so time the consumer spends on this
+            # page counts towards it, rather than sleeping the full delay after.
+            if page_token and self._inter_page_delay > 0:
+                next_allowed = time.monotonic() + self._inter_page_delay
+
+            # A missing key and an empty list are handled by the same branch
+            messages = response.get("messages") or ()
+            if messages:
+                stubs = [MessageStub(msg["id"], msg["threadId"]) for msg in messages]
+                logger.debug("Discovered %d message IDs (page)", len(stubs))
+                yield stubs
+
             if not page_token:
                 return
 
@@ -162,7 +287,7 @@ class GmailClient:
         This captures the latest historyId BEFORE discovery, so any messages
         arriving during discovery are caught on the next incremental sync.
         """
-        request = self._service.users().getProfile(userId=self._user_id)
+        request = self._users.getProfile(userId=self._user_id)
         response = self._execute_with_retry(request, "get profile")
         return str(response["historyId"])
 
@@ -186,24 +311,24 @@ class GmailClient:
         Raises:
             HistoryExpiredError: When the historyId is no longer valid (404).
         """
+        base_kwargs: dict[str, Any] = {
+            "userId": self._user_id,
+            "startHistoryId": start_history_id,
+            "historyTypes": ["messageAdded"],
+            "labelId": label_id,
+        }
+
         page_token: str | None = None
-        first_page = True
+        next_allowed: float | None = None
 
         while True:
-            if not first_page and self._inter_page_delay > 0:
-                time.sleep(self._inter_page_delay)
-            first_page = False
+            if next_allowed is not None:
+                remaining = next_allowed - time.monotonic()
+                if remaining > 0:
+                    time.sleep(remaining)
 
-            kwargs: dict[str, Any] = {
-                "userId": self._user_id,
-                "startHistoryId": start_history_id,
-                "historyTypes": ["messageAdded"],
-                "labelId": label_id,
-            }
-            if page_token:
-                kwargs["pageToken"] = page_token
-
-            request = self._service.users().history().list(**kwargs)
+            kwargs = {**base_kwargs, "pageToken": page_token} if page_token else base_kwargs
+            request = self._history.list(**kwargs)
 
             try:
                 response = self._execute_with_retry(request, "incremental discovery")
@@ -223,6 +348,9 @@ class GmailClient:
             if not history_records:
                 return
 
+            if self._inter_page_delay > 0:
+                next_allowed = time.monotonic() + self._inter_page_delay
+
             # Deduplicate message IDs within this page
             seen: set[str] = set()
             stubs: list[MessageStub] = []
@@ -243,83 +371,187 @@ class GmailClient:
             if not page_token:
                 return
 
+    def stream_messages(
+        self,
+        label_id: str,
+        max_results_per_page: int = 100,
+        query: str | None = None,
+    ) -> Generator[dict[str, Any], None, None]:
+        """Discover and fetch messages for a label as one overlapped pipeline.
+
+        With a service_factory, discovery runs on a background thread that
+        owns its own service (and so its own HTTP transport), handing pages over
+        through a small bounded queue: the next messages.list call is in flight
+        while the current page is being batch fetched. Without one, discovery
+        and fetching alternate on the calling thread, since the client's
+        service must not be shared across threads.
+
+        Args:
+            label_id: Gmail label ID to filter by.
+            max_results_per_page: Number of messages per discovery page (1-500).
+            query: Optional Gmail search query to further filter.
+
+        Yields:
+            Raw Gmail API message dicts, in discovery order.
+        """
+        if self._service_factory is None:
+            for page in self.discover_message_ids(label_id, max_results_per_page, query):
+                yield from self.fetch_messages_batch([stub.message_id for stub in page])
+            return
+
+        pages: queue.Queue[list[MessageStub] | BaseException | None] = queue.Queue(maxsize=2)
+        stop = threading.Event()
+        service_factory = self._service_factory
+
+        def _discover() -> None:
+            try:
+                messages_resource = service_factory().users().messages()
+                for page in self._iter_message_pages(
+                    messages_resource, label_id, max_results_per_page, query, stop
+                ):
+                    pages.put(page)
+            except BaseException as e:
+                pages.put(e)
+            else:
+                pages.put(None)
+
+        producer = threading.Thread(target=_discover, name="gmail-discovery", daemon=True)
+        producer.start()
+
+        try:
+            while True:
+                item = pages.get()
+                if item is None:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield from self.fetch_messages_batch([stub.message_id for stub in item])
+        finally:
+            # Stop further list requests, and unblock a producer waiting on a
+            # full queue if the consumer stopped early
+            stop.set()
+            while True:
+                try:
+                    pages.get_nowait()
+                except queue.Empty:
+                    break
+
     def fetch_messages_batch(self, message_ids: list[str]) -> list[dict[str, Any]]:
-        """Fetch full message bodies in a single batch request.
+        """Fetch full message bodies using batch requests.
+
+        IDs are split into chunks of the current adaptive batch size, one batch
+        request per chunk. The size halves whenever a chunk is rate limited and
+        recovers gradually after consecutive chunks without a 429.
 
         Args:
-            message_ids: List of Gmail message IDs to fetch.
+            message_ids: List of Gmail message IDs to fetch. Duplicates are
+                fetched once.
 
         Returns:
-            List of raw Gmail API message dicts.
+            List of raw Gmail API message dicts, in input order.
         """
-        backoff = self._initial_backoff
+        if not message_ids:
+            return []
+        # Message IDs double as batch request IDs, which must be unique per batch
+        # (BatchHttpRequest.add raises KeyError otherwise); keep first occurrences
+        message_ids = list(dict.fromkeys(message_ids))
+
+        fetched: list[dict[str, Any]] = []
+        start = 0
+        while start < len(message_ids):
+            size = self._current_batch_size
+            fetched.extend(self._fetch_chunk(message_ids[start:start + size]))
+            start += size
+        return fetched
+
+    def _fetch_chunk(self, message_ids: list[str]) -> list[dict[str, Any]]:
+        """Fetch one chunk of messages in a single batch request.
+
+        On a 429, only the IDs that were rate limited are re-batched; messages
+        that already succeeded are not re-requested (each get costs quota).
+
+        Args:
+            message_ids: Gmail message IDs for this chunk (at most 100).
+
+        Returns:
+            List of raw Gmail API message dicts, in input order.
+        """
+        state = _BatchState(message_ids)
+        chunk_rate_limited = False
 
         for attempt in range(self._max_retries + 1):
-            results: list[dict[str, Any]] = []
-            errors: list[str] = []
-            rate_limited = False
-
-            def _callback(
-                request_id: str,
-                response: dict[str, Any] | None,
-                exception: Exception | None,
-            ) -> None:
-                nonlocal rate_limited
-                if exception:
-                    if _is_rate_limit_error(exception):
-                        rate_limited = True
-                        errors.append(f"Rate limited for {request_id}: {exception}")
-                    else:
-                        logger.warning("Batch fetch error for %s: %s", request_id, exception)
-                        errors.append(f"Error for {request_id}: {exception}")
-                elif response:
-                    results.append(response)
-
-            batch: BatchHttpRequest = self._service.new_batch_http_request(callback=_callback)
+            state.rate_limited = False
+            batch: BatchHttpRequest = self._batch_factory(
+                callback=state.callback
+            )
 
             for msg_id in message_ids:
-                batch.add(
-                    self._service.users()
-                    .messages()
-                    .get(
-                        userId=self._user_id,
-                        id=msg_id,
-                        format="full",
+                if msg_id in state.pending:
+                    batch.add(
+                        self._messages.get(
+                            userId=self._user_id,
+                            id=msg_id,
+                            format=self._message_format,
+                        ),
+                        request_id=msg_id,
                     )
-                )
 
             try:
                 batch.execute()
             except Exception as e:
                 if _is_rate_limit_error(e):
-                    rate_limited = True
+                    state.rate_limited = True
                 else:
                     raise GmailIngestorError(f"Batch request failed: {e}") from e
 
-            if rate_limited:
+            if state.rate_limited:
+                chunk_rate_limited = True
+                self._shrink_batch_size()
+
+            if state.rate_limited and state.pending:
                 if attempt >= self._max_retries:
                     raise RateLimitError(
                         f"Rate limited during batch fetch after {self._max_retries} retries"
                     )
-                sleep_time = min(backoff, self._max_backoff)
-                jitter = random.uniform(0, sleep_time)
+                jitter = self._rng.uniform(0, self._backoff_schedule[attempt])
                 logger.warning(
-                    "Rate limited during batch fetch (attempt %d/%d), sleeping %.2fs",
-                    attempt + 1, self._max_retries, jitter,
+                    "Rate limited during batch fetch (attempt %d/%d), "
+                    "retrying %d of %d messages in %.2fs",
+                    attempt + 1, self._max_retries, len(state.pending), len(message_ids), jitter,
                 )
                 time.sleep(jitter)
-                backoff = min(backoff * 2, self._max_backoff)
                 continue
 
-            if errors:
+            if state.errors:
                 logger.warning(
                     "Batch had %d errors out of %d requests",
-                    len(errors), len(message_ids),
+                    len(state.errors), len(message_ids),
                 )
 
-            logger.debug("Batch fetched %d messages", len(results))
-            return results
+            if not chunk_rate_limited:
+                self._grow_batch_size()
+
+            fetched = [r for r in state.results if r is not None]
+            logger.debug("Batch fetched %d messages", len(fetched))
+            return fetched
 
         raise RateLimitError(
             f"Rate limited during batch fetch after {self._max_retries} retries"
         )
+
+    def _shrink_batch_size(self) -> None:
+        """Halve the batch size after a rate-limited chunk (multiplicative decrease)."""
+        self._clean_chunks = 0
+        new_size = max(_MIN_BATCH_SIZE, self._current_batch_size // 2)
+        if new_size != self._current_batch_size:
+            logger.info("Reducing batch size to %d after rate limit", new_size)
+        self._current_batch_size = new_size
+
+    def _grow_batch_size(self) -> None:
+        """Grow the batch size after enough clean chunks (additive increase)."""
+        self._clean_chunks += 1
+        if self._clean_chunks >= _BATCH_RECOVERY_CHUNKS:
+            self._clean_chunks = 0
+            self._current_batch_size = min(
+                _MAX_BATCH_SIZE, self._current_batch_size + _BATCH_SIZE_STEP
+            )
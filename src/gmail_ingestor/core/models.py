@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, fields
 from datetime import datetime
+from typing import ClassVar
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MessageStub:
     """Lightweight message reference from Gmail list API."""
 
@@ -14,21 +15,27 @@ class MessageStub:
     thread_id: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EmailHeader:
     """Parsed email headers."""
 
+    # Field names in declaration order, computed once below the class body
+    _FIELD_NAMES: ClassVar[tuple[str, ...]]
+
     subject: str
     sender: str
     to: str
     date: datetime
     cc: str = ""
     message_id_header: str = ""
-    label_ids: tuple[str, ...] = field(default_factory=tuple)
-    label_names: tuple[str, ...] = field(default_factory=tuple)
+    label_ids: tuple[str, ...] = ()
+    label_names: tuple[str, ...] = ()
+
+
+EmailHeader._FIELD_NAMES = tuple(f.name for f in fields(EmailHeader))
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EmailBody:
     """Parsed email body content. At least one of plain_text or html will be set."""
 
@@ -36,19 +43,19 @@ class EmailBody:
     html: str | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EmailMessage:
     """Complete parsed email with headers and body."""
 
     message_id: str
     thread_id: str
-    label_ids: tuple[str, ...] = field(default_factory=tuple)
+    label_ids: tuple[str, ...] = ()
     header: EmailHeader | None = None
     body: EmailBody | None = None
     snippet: str = ""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ConvertedEmail:
     """Result of converting an email to markdown."""
 
@@ -57,7 +64,7 @@ class ConvertedEmail:
     header: EmailHeader
 
 
-@dataclass
+@dataclass(slots=True)
 class FetchProgress:
     """Mutable progress tracker for pipeline status reporting."""
 
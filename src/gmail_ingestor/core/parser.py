@@ -2,17 +2,37 @@
 
 from __future__ import annotations
 
-import base64
+import binascii
+import functools
 import logging
 from datetime import datetime
+from email import policy
+from email.parser import BytesParser
 from email.utils import parsedate_to_datetime
 from typing import Any
 
 from gmail_ingestor.core.exceptions import ParseError
 from gmail_ingestor.core.models import EmailBody, EmailHeader, EmailMessage
 
+try:
+    from fast_mail_parser import parse_email as _fast_parse_email
+except ImportError:  # optional: pip install gmail-ingestor[fast]
+    _fast_parse_email = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
+# Header names (lowercased) that map onto EmailHeader fields; a frozenset so the
+# per-header membership test is one hash probe rather than a scan
+_HEADER_NAMES = frozenset(("subject", "from", "to", "date", "cc", "message-id"))
+
+# Shared fallbacks for missing headers; datetimes are immutable, so every
+# message without a parseable Date gets the same epoch instance
+_NO_SUBJECT = "(no subject)"
+_EPOCH = datetime(1970, 1, 1)
+
+# base64url alphabet (-_) back to standard base64 (+/)
+_URLSAFE_TO_STD = bytes.maketrans(b"-_", b"+/")
+
 
 class GmailParser:
     """Parses raw Gmail API message dicts into EmailMessage objects."""
@@ -34,10 +54,15 @@ class GmailParser:
             thread_id = raw_message.get("threadId", "")
             label_ids = tuple(raw_message.get("labelIds", []))
             snippet = raw_message.get("snippet", "")
-            payload = raw_message.get("payload", {})
 
-            header = self._extract_headers(payload)
-            body = self._extract_body(payload)
+            raw = raw_message.get("raw")
+            if raw:
+                # format=raw: the whole RFC 822 message as one base64url blob
+                header, body = self._parse_raw(raw)
+            else:
+                payload = raw_message.get("payload", {})
+                header = self._extract_headers(payload)
+                body = self._extract_body(payload)
 
             return EmailMessage(
                 message_id=message_id,
@@ -52,20 +77,78 @@ class GmailParser:
         except Exception as e:
             raise ParseError(f"Failed to parse message {raw_message.get('id', '?')}: {e}") from e
 
+    def _parse_raw(self, raw: str) -> tuple[EmailHeader, EmailBody]:
+        """Parse a base64url-encoded RFC 822 message (Gmail format=raw).
+
+        Uses the native fast_mail_parser backend when installed, falling back
+        to the stdlib email parser if it is missing or rejects the message.
+
+        Args:
+            raw: The message's ``raw`` field from the Gmail API.
+
+        Returns:
+            Tuple of (header, body).
+        """
+        blob = self._decode_bytes(raw)
+        if _fast_parse_email is not None:
+            try:
+                mail = _fast_parse_email(blob)
+            except Exception as e:
+                logger.debug("fast_mail_parser rejected message, using stdlib parser: %s", e)
+            else:
+                headers = {
+                    name.lower(): values[0]
+                    for name, values in mail.headers.items()
+                    if values and name.lower() in _HEADER_NAMES
+                }
+                return self._build_header(headers), EmailBody(
+                    plain_text=mail.text_plain[0] if mail.text_plain else None,
+                    html=mail.text_html[0] if mail.text_html else None,
+                )
+
+        msg = BytesParser(policy=policy.default).parsebytes(blob)
+        headers = {name: str(msg[name]) for name in _HEADER_NAMES if msg[name] is not None}
+        plain_part = msg.get_body(preferencelist=("plain",))
+        html_part = msg.get_body(preferencelist=("html",))
+        return self._build_header(headers), EmailBody(
+            plain_text=plain_part.get_content() if plain_part is not None else None,
+            html=html_part.get_content() if html_part is not None else None,
+        )
+
     def _extract_headers(self, payload: dict[str, Any]) -> EmailHeader:
         """Extract standard email headers from the payload."""
-        headers_list = payload.get("headers", [])
+        return self._build_header(self._index_headers(payload.get("headers", [])))
+
+    @staticmethod
+    def _index_headers(headers_list: list[dict[str, str]]) -> dict[str, str]:
+        """Index the wanted headers by lowercased name in a single pass.
+
+        The first occurrence of a header wins, matching the stdlib and
+        fast_mail_parser paths, so the scan stops once every wanted header is seen.
+
+        Args:
+            headers_list: Gmail API ``payload.headers`` list of name/value dicts.
+
+        Returns:
+            Dict of lowercased header name to value.
+        """
         headers: dict[str, str] = {}
+        wanted = len(_HEADER_NAMES)
         for h in headers_list:
             name = h.get("name", "").lower()
-            if name in ("subject", "from", "to", "date", "cc", "message-id"):
+            if name in _HEADER_NAMES and name not in headers:
                 headers[name] = h.get("value", "")
+                if len(headers) == wanted:
+                    break
+        return headers
 
+    def _build_header(self, headers: dict[str, str]) -> EmailHeader:
+        """Build an EmailHeader from a dict keyed by lowercased header name."""
         date_str = headers.get("date", "")
         date = self._parse_date(date_str)
 
         return EmailHeader(
-            subject=headers.get("subject", "(no subject)"),
+            subject=headers.get("subject", _NO_SUBJECT),
             sender=headers.get("from", ""),
             to=headers.get("to", ""),
             date=date,
@@ -74,7 +157,7 @@ class GmailParser:
         )
 
     def _extract_body(self, payload: dict[str, Any]) -> EmailBody:
-        """Recursively walk the MIME tree to extract text/html bodies."""
+        """Walk the MIME tree iteratively, stopping once both text and html bodies are found."""
         plain_text: str | None = None
         html: str | None = None
 
@@ -84,7 +167,7 @@ class GmailParser:
             # Try the top-level body directly
             body_data = payload.get("body", {}).get("data")
             if body_data:
-                mime_type = payload.get("mimeType", "")
+                mime_type = payload.get("mimeType", "").lower()
                 decoded = self._decode_body(body_data)
                 if "html" in mime_type:
                     html = decoded
@@ -94,7 +177,10 @@ class GmailParser:
         return EmailBody(plain_text=plain_text, html=html)
 
     def _walk_parts(self, part: dict[str, Any]) -> tuple[str | None, str | None]:
-        """Recursively walk MIME parts to find text/plain and text/html.
+        """Walk MIME parts depth-first to find the first text/plain and text/html.
+
+        Uses an explicit stack rather than recursion and stops as soon as both
+        bodies are found. Attachments (parts with a filename) are skipped.
 
         Args:
             part: A MIME part dict from the Gmail API.
@@ -104,43 +190,65 @@ class GmailParser:
         """
         plain_text: str | None = None
         html: str | None = None
-        mime_type = part.get("mimeType", "")
-
-        if mime_type == "text/plain":
-            data = part.get("body", {}).get("data")
-            if data:
-                plain_text = self._decode_body(data)
-        elif mime_type == "text/html":
-            data = part.get("body", {}).get("data")
-            if data:
-                html = self._decode_body(data)
-        elif mime_type.startswith("multipart/"):
-            for sub_part in part.get("parts", []):
-                # Skip attachments
-                if sub_part.get("filename"):
-                    continue
-
-                sub_plain, sub_html = self._walk_parts(sub_part)
-                if sub_plain and not plain_text:
-                    plain_text = sub_plain
-                if sub_html and not html:
-                    html = sub_html
+        stack = [part]
+
+        while stack:
+            current = stack.pop()
+            # MIME types are case-insensitive (RFC 2045); lowercase once per part
+            mime_type = current.get("mimeType", "").lower()
+
+            if mime_type == "text/plain":
+                if not plain_text:
+                    data = current.get("body", {}).get("data")
+                    if data:
+                        plain_text = self._decode_body(data) or None
+            elif mime_type == "text/html":
+                if not html:
+                    data = current.get("body", {}).get("data")
+                    if data:
+                        html = self._decode_body(data) or None
+            elif mime_type.startswith("multipart/"):
+                # Pushed in reverse so parts pop off in document order
+                stack.extend(
+                    sub_part
+                    for sub_part in reversed(current.get("parts", []))
+                    if not sub_part.get("filename")
+                )
+
+            if plain_text and html:
+                break
 
         return plain_text, html
 
     @staticmethod
-    def _decode_body(data: str) -> str:
+    def _decode_body(data: str | bytes) -> str:
         """Decode base64url-encoded body data.
 
         Args:
-            data: Base64url-encoded string from Gmail API.
+            data: Base64url-encoded string (or its ASCII bytes) from Gmail API.
 
         Returns:
             Decoded UTF-8 string.
         """
-        # Gmail uses base64url encoding (RFC 4648 §5)
-        padded = data + "=" * (4 - len(data) % 4) if len(data) % 4 else data
-        return base64.urlsafe_b64decode(padded).decode("utf-8", errors="replace")
+        if not data:
+            return ""
+        return GmailParser._decode_bytes(data).decode("utf-8", errors="replace")
+
+    @staticmethod
+    def _decode_bytes(data: str | bytes) -> bytes:
+        """Decode base64url-encoded data to raw bytes.
+
+        Args:
+            data: Base64url-encoded string (or its ASCII bytes) from Gmail API.
+
+        Returns:
+            Decoded bytes.
+        """
+        if isinstance(data, str):
+            data = data.encode("ascii")
+        # Gmail uses base64url encoding (RFC 4648 §5) with the padding stripped;
+        # -len & 3 is the number of "=" needed to reach a multiple of 4
+        return binascii.a2b_base64(data.translate(_URLSAFE_TO_STD) + b"==="[: -len(data) & 3])
 
     @staticmethod
     def _parse_date(date_str: str) -> datetime:
@@ -152,10 +260,20 @@ class GmailParser:
         Returns:
             Parsed datetime, or epoch datetime if parsing fails.
         """
-        if not date_str:
-            return datetime(1970, 1, 1)
-        try:
-            return parsedate_to_datetime(date_str)
-        except Exception:
-            logger.warning("Failed to parse date: %s", date_str)
-            return datetime(1970, 1, 1)
+        return _parse_date_cached(date_str)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_date_cached(date_str: str) -> datetime:
+    """Memoized body of GmailParser._parse_date.
+
+    Bulk mail repeats the same Date header, and datetimes are immutable, so
+    results are safe to share. An unparseable string is logged on first sight only.
+    """
+    if not date_str:
+        return _EPOCH
+    try:
+        return parsedate_to_datetime(date_str)
+    except (TypeError, ValueError):
+        logger.warning("Failed to parse date: %s", date_str)
+        return _EPOCH
@@ -80,6 +80,7 @@ class EmailIngestor:
                 max_backoff_seconds=self._settings.max_backoff_seconds,
                 inter_page_delay_seconds=self._settings.inter_page_delay_seconds,
                 num_retries=self._settings.num_retries,
+                message_format=self._settings.message_format,
             )
 
         if self._tracker is None:
@@ -0,0 +1,25 @@
+"""Low-level file writing shared by the storage writers."""
+
+from __future__ import annotations
+
+import os
+
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+
+def write_bytes(path: str, data: bytes) -> None:
+    """Write data to path with raw os-level calls, bypassing the text I/O layers.
+
+    Creates or truncates the file; loops on short writes.
+
+    Args:
+        path: Destination file path.
+        data: Bytes to write.
+    """
+    fd = os.open(path, _WRITE_FLAGS, 0o666)  # the umask narrows it, as open() does
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
@@ -3,9 +3,13 @@
 from __future__ import annotations
 
 import logging
+import os
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from gmail_ingestor.core.models import EmailBody
+from gmail_ingestor.storage.fileio import write_bytes
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +20,8 @@ class RawEmailStore:
     def __init__(self, raw_dir: Path) -> None:
         self._raw_dir = raw_dir
         self._raw_dir.mkdir(parents=True, exist_ok=True)
+        # Directory path with a trailing separator, so file paths are one f-string
+        self._raw_prefix = os.path.join(str(raw_dir), "")
 
     def store(self, message_id: str, body: EmailBody) -> dict[str, Path]:
         """Save the original email body content to files.
@@ -28,17 +34,41 @@ class RawEmailStore:
             Dict with 'text' and/or 'html' keys mapping to saved file paths.
         """
         saved: dict[str, Path] = {}
+        # Encode every present part up front, then one open/write/close per file
+        parts = [
+            (key, ext, content.encode("utf-8"))
+            for key, ext, content in (("text", "txt", body.plain_text), ("html", "html", body.html))
+            if content
+        ]
+        for key, ext, data in parts:
+            path = f"{self._raw_prefix}{message_id}.{ext}"
+            write_bytes(path, data)
+            saved[key] = Path(path)
+            logger.debug("Saved raw %s: %s", key, path)
 
-        if body.plain_text:
-            text_path = self._raw_dir / f"{message_id}.txt"
-            text_path.write_text(body.plain_text, encoding="utf-8")
-            saved["text"] = text_path
-            logger.debug("Saved raw text: %s", text_path)
+        return saved
 
-        if body.html:
-            html_path = self._raw_dir / f"{message_id}.html"
-            html_path.write_text(body.html, encoding="utf-8")
-            saved["html"] = html_path
-            logger.debug("Saved raw HTML: %s", html_path)
+    def store_many(
+        self, items: Iterable[tuple[str, EmailBody]], *, max_workers: int = 8
+    ) -> dict[str, dict[str, Path]]:
+        """Save several message bodies concurrently on a thread pool.
 
-        return saved
+        File writes release the GIL, so the per-message open/write/close calls
+        overlap instead of running back to back.
+
+        Args:
+            items: (message_id, body) pairs to save.
+            max_workers: Maximum number of writer threads.
+
+        Returns:
+            Dict mapping each message ID to its store() result.
+
+        Raises:
+            OSError: If any write fails; the remaining writes still run to completion.
+        """
+        pairs = list(items)
+        if not pairs:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pairs))) as pool:
+            results = pool.map(lambda pair: self.store(*pair), pairs)
+            return {message_id: saved for (message_id, _), saved in zip(pairs, results)}
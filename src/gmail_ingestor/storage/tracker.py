@@ -2,8 +2,13 @@
 
 from __future__ import annotations
 
+import functools
 import logging
+import queue
 import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import UTC, datetime
 from pathlib import Path
 
@@ -12,6 +17,173 @@ logger = logging.getLogger(__name__)
 # Status state machine: pending → fetched → converted (or → failed → pending on retry)
 VALID_STATUSES = {"pending", "fetched", "converted", "failed"}
 
+# Applied on every connect. WAL lets readers run alongside the writer, and
+# synchronous=NORMAL is durable under WAL while skipping an fsync per commit.
+_CONNECTION_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "cache_size=-65536",  # 64 MiB page cache (negative = KiB)
+    "mmap_size=268435456",  # 256 MiB memory-mapped I/O
+    "busy_timeout=5000",  # ms to wait on a locked database before failing
+)
+
+# The pending and fetched queue read, shared through _ids_by_status(); tests
+# EXPLAIN it to check it stays on the covering status index
+_SELECT_IDS_BY_STATUS_SQL = (
+    "SELECT message_id FROM messages WHERE status = ? ORDER BY created_at LIMIT ? OFFSET ?"
+)
+
+# Most queued writes the async writer thread commits in one transaction
+_ASYNC_WRITER_BATCH = 500
+
+# Queue marker telling the async writer thread to exit
+_STOP_WRITER = object()
+
+# How often flush() checks that the writer thread is still alive while waiting
+_FLUSH_POLL_SECONDS = 0.5
+
+
+def _update_status_params(
+    message_id: str,
+    status: str,
+    *,
+    subject: str = "",
+    sender: str = "",
+    date: str = "",
+    raw_text_path: str = "",
+    raw_html_path: str = "",
+    markdown_path: str = "",
+    error_message: str = "",
+) -> tuple[str | None, ...]:
+    """Validate a status change and build the _UPDATE_STATUS_SQL parameters."""
+    if status not in VALID_STATUSES:
+        raise ValueError(f"Invalid status: {status}")
+
+    now = datetime.now(UTC).isoformat()
+    # Empty strings mean "leave unchanged": passing None lets COALESCE keep the column
+    return (
+        status,
+        now,
+        subject or None,
+        sender or None,
+        date or None,
+        raw_text_path or None,
+        raw_html_path or None,
+        markdown_path or None,
+        error_message or None,
+        message_id,
+    )
+
+
+# Rows per multi-VALUES insert: 5 bound parameters per row stays under
+# SQLite's historical 999-variable limit
+_INSERT_CHUNK_ROWS = 199
+
+
+@functools.cache
+def _insert_pending_values_sql(rows: int) -> str:
+    """INSERT OR IGNORE of *rows* pending messages in a single statement."""
+    values = ", ".join(["(?, ?, ?, 'pending', ?, ?)"] * rows)
+    return (
+        "INSERT OR IGNORE INTO messages "
+        "(message_id, thread_id, label_id, status, created_at, updated_at) "
+        f"VALUES {values}"
+    )
+
+
+# Secondary indexes on messages, by name. Kept apart from the table DDL so
+# bulk_insert_pending can drop and rebuild them around very large loads.
+_MESSAGE_INDEXES = {
+    "idx_messages_label": "messages(label_id)",
+    # Covers the get_pending_ids/get_fetched_ids queue reads: filter on status,
+    # walk in created_at order, read message_id from the index. Its status
+    # prefix also serves count_by_status and the status-only filters.
+    "idx_messages_status_created": "messages(status, created_at, message_id)",
+}
+
+# Indexes superseded by the ones above, dropped from databases that still have them
+_OBSOLETE_INDEXES = ("idx_messages_status",)  # prefix of idx_messages_status_created
+
+_MESSAGE_INDEX_DDL = tuple(
+    f"CREATE INDEX IF NOT EXISTS {name} ON {target}" for name, target in _MESSAGE_INDEXES.items()
+)
+
+# Full schema, run as one executescript() in a single transaction on connect
+_SCHEMA_SQL = "\n".join(
+    (
+        "BEGIN;",
+        """
+        CREATE TABLE IF NOT EXISTS messages (
+            message_id TEXT PRIMARY KEY,
+            thread_id TEXT NOT NULL,
+            label_id TEXT NOT NULL DEFAULT '',
+            status TEXT NOT NULL DEFAULT 'pending',
+            subject TEXT DEFAULT '',
+            sender TEXT DEFAULT '',
+            date TEXT DEFAULT '',
+            raw_text_path TEXT DEFAULT '',
+            raw_html_path TEXT DEFAULT '',
+            markdown_path TEXT DEFAULT '',
+            error_message TEXT DEFAULT '',
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS labels (
+            label_id TEXT PRIMARY KEY,
+            label_name TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS message_labels (
+            message_id TEXT NOT NULL,
+            label_id TEXT NOT NULL,
+            PRIMARY KEY (message_id, label_id),
+            FOREIGN KEY (message_id) REFERENCES messages(message_id),
+            FOREIGN KEY (label_id) REFERENCES labels(label_id)
+        );
+
+        CREATE TABLE IF NOT EXISTS fetch_runs (
+            run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            label_id TEXT NOT NULL,
+            started_at TEXT NOT NULL,
+            completed_at TEXT,
+            ids_discovered INTEGER DEFAULT 0,
+            messages_fetched INTEGER DEFAULT 0,
+            messages_converted INTEGER DEFAULT 0,
+            messages_failed INTEGER DEFAULT 0
+        );
+
+        CREATE TABLE IF NOT EXISTS sync_state (
+            label_id TEXT PRIMARY KEY,
+            history_id TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        );
+        """,
+        *(f"{statement};" for statement in _MESSAGE_INDEX_DDL),
+        *(f"DROP INDEX IF EXISTS {name};" for name in _OBSOLETE_INDEXES),
+        "COMMIT;",
+    )
+)
+
+# Below this many stubs, maintaining the indexes row by row beats a rebuild
+_DROP_INDEXES_MIN_ROWS = 5000
+
+# Fixed statement text so sqlite3's statement cache prepares it once; COALESCE
+# keeps the stored value for every metadata field bound as NULL.
+_UPDATE_STATUS_SQL = """UPDATE messages SET
+    status = ?,
+    updated_at = ?,
+    subject = COALESCE(?, subject),
+    sender = COALESCE(?, sender),
+    date = COALESCE(?, date),
+    raw_text_path = COALESCE(?, raw_text_path),
+    raw_html_path = COALESCE(?, raw_html_path),
+    markdown_path = COALESCE(?, markdown_path),
+    error_message = COALESCE(?, error_message)
+    WHERE message_id = ?"""
+
 
 class FetchTracker:
     """Tracks email processing state in SQLite.
@@ -24,20 +196,141 @@ class FetchTracker:
     def __init__(self, db_path: Path) -> None:
         self._db_path = db_path
         self._conn: sqlite3.Connection | None = None
+        self._writer_queue: queue.SimpleQueue[object] | None = None
+        self._writer_thread: threading.Thread | None = None
+        self._writer_error: Exception | None = None
 
     def connect(self) -> None:
         """Open database connection and ensure schema exists."""
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn = sqlite3.connect(str(self._db_path), check_same_thread=False)
+        self._conn = self._open_connection()
         self._conn.row_factory = sqlite3.Row
-        self._conn.execute("PRAGMA journal_mode=WAL")
         self._create_tables()
 
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open a tuned connection to the database file."""
+        # Autocommit mode: single statements commit on their own, and multi-row
+        # writes open their transaction explicitly through _tx()
+        conn = sqlite3.connect(str(self._db_path), check_same_thread=False, isolation_level=None)
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(f"PRAGMA {pragma}")
+        return conn
+
     def close(self) -> None:
-        """Close the database connection."""
-        if self._conn:
-            self._conn.close()
-            self._conn = None
+        """Flush and stop the async writer, if running, then close the connection.
+
+        Runs PRAGMA optimize first, so the planner statistics reflect this
+        session's writes when the next run opens the database.
+        """
+        try:
+            self._stop_async_writer()
+        finally:
+            if self._conn:
+                try:
+                    self._conn.execute("PRAGMA optimize")
+                except sqlite3.Error as e:
+                    logger.warning("PRAGMA optimize failed on close: %s", e)
+                self._conn.close()
+                self._conn = None
+
+    def start_async_writer(self) -> None:
+        """Start a background thread that applies update_status_async() writes.
+
+        The thread owns its own connection to the database file, so queued
+        writes never interleave with transactions on the main connection.
+        Pending writes are drained in batches, one transaction per batch.
+        Calling this again while the writer is running is a no-op.
+        """
+        if self._writer_thread is not None:
+            return
+        self._writer_error = None
+        self._writer_queue = queue.SimpleQueue()
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop,
+            args=(self._open_connection(), self._writer_queue),
+            name="fetch-tracker-writer",
+            daemon=True,
+        )
+        self._writer_thread.start()
+
+    def flush(self) -> None:
+        """Block until every queued async write has been committed.
+
+        Raises:
+            Exception: The error of a queued batch that failed since the last
+                flush (normally a sqlite3.Error).
+            RuntimeError: If the writer thread exited before reaching the flush.
+        """
+        if self._writer_queue is None or self._writer_thread is None:
+            return
+        done = threading.Event()
+        self._writer_queue.put(done)
+        while not done.wait(_FLUSH_POLL_SECONDS):
+            if not self._writer_thread.is_alive():
+                break
+        error, self._writer_error = self._writer_error, None
+        if error is not None:
+            raise error
+        if not done.is_set():
+            raise RuntimeError("Async writer thread exited with writes still queued")
+
+    def _stop_async_writer(self) -> None:
+        """Flush pending writes and join the writer thread."""
+        if self._writer_queue is None or self._writer_thread is None:
+            return
+        try:
+            self.flush()
+        finally:
+            self._writer_queue.put(_STOP_WRITER)
+            self._writer_thread.join()
+            self._writer_queue = None
+            self._writer_thread = None
+
+    def _writer_loop(self, conn: sqlite3.Connection, work: queue.SimpleQueue[object]) -> None:
+        """Drain (sql, params) items from the queue, committing them in batches."""
+        try:
+            stop = False
+            while not stop:
+                batch: list[tuple[str, tuple[object, ...]]] = []
+                waiters: list[threading.Event] = []
+                item = work.get()
+                while True:
+                    if item is _STOP_WRITER:
+                        stop = True
+                    elif isinstance(item, threading.Event):
+                        waiters.append(item)
+                    else:
+                        batch.append(item)  # type: ignore[arg-type]
+                    if stop or len(batch) >= _ASYNC_WRITER_BATCH or work.empty():
+                        break
+                    item = work.get()
+                try:
+                    if batch:
+                        self._apply_batch(conn, batch)
+                finally:
+                    # Release flush() callers even if the batch blew up
+                    for waiter in waiters:
+                        waiter.set()
+        finally:
+            conn.close()
+
+    def _apply_batch(
+        self, conn: sqlite3.Connection, batch: list[tuple[str, tuple[object, ...]]]
+    ) -> None:
+        """Commit one batch of queued writes, recording any error for flush()."""
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for sql, params in batch:
+                conn.execute(sql, params)
+            conn.execute("COMMIT")
+        except Exception as e:
+            logger.error("Async writer batch of %d failed: %s", len(batch), e)
+            if conn.in_transaction:
+                try:
+                    conn.execute("ROLLBACK")
+                except sqlite3.Error as rollback_error:
+                    logger.error("Async writer rollback failed: %s", rollback_error)
+            self._writer_error = e
 
     def __enter__(self) -> FetchTracker:
         self.connect()
@@ -52,59 +345,43 @@ class FetchTracker:
             raise RuntimeError("Database not connected. Call connect() first.")
         return self._conn
 
+    def _tuple_cursor(self) -> sqlite3.Cursor:
+        """Cursor yielding plain tuples, skipping the connection's sqlite3.Row factory."""
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        return cursor
+
+    @contextmanager
+    def _tx(self) -> Iterator[sqlite3.Connection]:
+        """Run the enclosed statements as one write transaction.
+
+        BEGIN IMMEDIATE takes the write lock up front, so a batch never fails
+        half-way on a lock upgrade. Rolls back if the block raises.
+        """
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            # SQLite may already have rolled back (e.g. on SQLITE_FULL); never let
+            # a failing ROLLBACK mask the error that got us here
+            if conn.in_transaction:
+                try:
+                    conn.execute("ROLLBACK")
+                except sqlite3.Error as rollback_error:
+                    logger.error("Rollback failed: %s", rollback_error)
+            raise
+        conn.execute("COMMIT")
+
     def _create_tables(self) -> None:
-        """Create tables if they don't exist."""
-        self.conn.executescript("""
-            CREATE TABLE IF NOT EXISTS messages (
-                message_id TEXT PRIMARY KEY,
-                thread_id TEXT NOT NULL,
-                label_id TEXT NOT NULL DEFAULT '',
-                status TEXT NOT NULL DEFAULT 'pending',
-                subject TEXT DEFAULT '',
-                sender TEXT DEFAULT '',
-                date TEXT DEFAULT '',
-                raw_text_path TEXT DEFAULT '',
-                raw_html_path TEXT DEFAULT '',
-                markdown_path TEXT DEFAULT '',
-                error_message TEXT DEFAULT '',
-                created_at TEXT NOT NULL,
-                updated_at TEXT NOT NULL
-            );
-
-            CREATE INDEX IF NOT EXISTS idx_messages_status ON messages(status);
-            CREATE INDEX IF NOT EXISTS idx_messages_label ON messages(label_id);
-
-            CREATE TABLE IF NOT EXISTS labels (
-                label_id TEXT PRIMARY KEY,
-                label_name TEXT NOT NULL,
-                updated_at TEXT NOT NULL
-            );
-
-            CREATE TABLE IF NOT EXISTS message_labels (
-                message_id TEXT NOT NULL,
-                label_id TEXT NOT NULL,
-                PRIMARY KEY (message_id, label_id),
-                FOREIGN KEY (message_id) REFERENCES messages(message_id),
-                FOREIGN KEY (label_id) REFERENCES labels(label_id)
-            );
-
-            CREATE TABLE IF NOT EXISTS fetch_runs (
-                run_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                label_id TEXT NOT NULL,
-                started_at TEXT NOT NULL,
-                completed_at TEXT,
-                ids_discovered INTEGER DEFAULT 0,
-                messages_fetched INTEGER DEFAULT 0,
-                messages_converted INTEGER DEFAULT 0,
-                messages_failed INTEGER DEFAULT 0
-            );
-
-            CREATE TABLE IF NOT EXISTS sync_state (
-                label_id TEXT PRIMARY KEY,
-                history_id TEXT NOT NULL,
-                updated_at TEXT NOT NULL
-            );
-        """)
+        """Create tables and indexes if they don't exist."""
+        self.conn.executescript(_SCHEMA_SQL)
+
+    @staticmethod
+    def _create_message_indexes(conn: sqlite3.Connection) -> None:
+        """Create the secondary indexes on messages if they don't exist."""
+        for statement in _MESSAGE_INDEX_DDL:
+            conn.execute(statement)
 
     def insert_pending(self, message_id: str, thread_id: str, label_id: str) -> bool:
         """Insert a message as 'pending' if not already tracked.
@@ -119,32 +396,48 @@ class FetchTracker:
                    VALUES (?, ?, ?, 'pending', ?, ?)""",
                 (message_id, thread_id, label_id, now, now),
             )
-            self.conn.commit()
             return self.conn.total_changes > 0
         except sqlite3.Error as e:
             logger.error("Failed to insert pending message %s: %s", message_id, e)
             return False
 
-    def bulk_insert_pending(self, stubs: list[tuple[str, str]], label_id: str) -> int:
+    def bulk_insert_pending(
+        self, stubs: list[tuple[str, str]], label_id: str, *, drop_indexes: bool = False
+    ) -> int:
         """Bulk insert message stubs as 'pending', skipping existing ones.
 
         Args:
             stubs: List of (message_id, thread_id) tuples.
             label_id: The label being fetched.
+            drop_indexes: For large initial loads, drop the secondary indexes
+                before inserting and rebuild them afterwards in the same
+                transaction. Ignored below 5000 stubs.
 
         Returns:
             Number of newly inserted rows.
         """
         now = datetime.now(UTC).isoformat()
-        rows = [(msg_id, thread_id, label_id, "pending", now, now) for msg_id, thread_id in stubs]
-        cursor = self.conn.executemany(
-            """INSERT OR IGNORE INTO messages
-               (message_id, thread_id, label_id, status, created_at, updated_at)
-               VALUES (?, ?, ?, ?, ?, ?)""",
-            rows,
-        )
-        self.conn.commit()
-        return cursor.rowcount
+        rebuild = drop_indexes and len(stubs) >= _DROP_INDEXES_MIN_ROWS
+        # One transaction (a single commit/fsync) for the whole batch
+        with self._tx() as conn:
+            if rebuild:
+                for name in _MESSAGE_INDEXES:
+                    conn.execute(f"DROP INDEX IF EXISTS {name}")
+            # Multi-VALUES chunks: one statement step inserts a few hundred rows
+            inserted = 0
+            row_tail = (label_id, now, now)  # shared by every row
+            for start in range(0, len(stubs), _INSERT_CHUNK_ROWS):
+                chunk = stubs[start : start + _INSERT_CHUNK_ROWS]
+                # Flat parameter list via list.extend: no per-row tuple or generator frame
+                params: list[str] = []
+                for stub in chunk:
+                    params += stub
+                    params += row_tail
+                cursor = conn.execute(_insert_pending_values_sql(len(chunk)), params)
+                inserted += cursor.rowcount
+            if rebuild:
+                self._create_message_indexes(conn)
+        return inserted
 
     def update_status(
         self,
@@ -160,59 +453,80 @@ class FetchTracker:
         error_message: str = "",
     ) -> None:
         """Update the status and metadata of a tracked message."""
-        if status not in VALID_STATUSES:
-            raise ValueError(f"Invalid status: {status}")
-
-        now = datetime.now(UTC).isoformat()
-        sets = ["status = ?", "updated_at = ?"]
-        params: list[str] = [status, now]
-
-        if subject:
-            sets.append("subject = ?")
-            params.append(subject)
-        if sender:
-            sets.append("sender = ?")
-            params.append(sender)
-        if date:
-            sets.append("date = ?")
-            params.append(date)
-        if raw_text_path:
-            sets.append("raw_text_path = ?")
-            params.append(raw_text_path)
-        if raw_html_path:
-            sets.append("raw_html_path = ?")
-            params.append(raw_html_path)
-        if markdown_path:
-            sets.append("markdown_path = ?")
-            params.append(markdown_path)
-        if error_message:
-            sets.append("error_message = ?")
-            params.append(error_message)
-
-        params.append(message_id)
         self.conn.execute(
-            f"UPDATE messages SET {', '.join(sets)} WHERE message_id = ?",
-            params,
+            _UPDATE_STATUS_SQL,
+            _update_status_params(
+                message_id,
+                status,
+                subject=subject,
+                sender=sender,
+                date=date,
+                raw_text_path=raw_text_path,
+                raw_html_path=raw_html_path,
+                markdown_path=markdown_path,
+                error_message=error_message,
+            ),
+        )
+
+    def update_status_async(self, message_id: str, status: str, **metadata: str) -> None:
+        """Queue an update_status() call for the async writer thread.
+
+        Returns immediately; the write is committed by the writer thread,
+        batched with other queued updates. Call flush() to wait for it.
+
+        Args:
+            message_id: Gmail message ID.
+            status: New status.
+            **metadata: Same optional fields as update_status().
+
+        Raises:
+            ValueError: If the status is invalid (checked before queueing).
+            RuntimeError: If start_async_writer() has not been called.
+        """
+        if self._writer_queue is None:
+            raise RuntimeError("Async writer not started. Call start_async_writer() first.")
+        self._writer_queue.put(
+            (_UPDATE_STATUS_SQL, _update_status_params(message_id, status, **metadata))
         )
-        self.conn.commit()
+
+    def update_status_many(self, updates: list[tuple[str, str]]) -> int:
+        """Set the status of many tracked messages in a single transaction.
+
+        Metadata columns are left untouched; use update_status for those.
+
+        Args:
+            updates: List of (message_id, status) tuples.
+
+        Returns:
+            Number of rows updated.
+        """
+        for _, status in updates:
+            if status not in VALID_STATUSES:
+                raise ValueError(f"Invalid status: {status}")
+
+        now = datetime.now(UTC).isoformat()
+        with self._tx() as conn:
+            cursor = conn.executemany(
+                _UPDATE_STATUS_SQL,
+                (
+                    (status, now, None, None, None, None, None, None, None, msg_id)
+                    for msg_id, status in updates
+                ),
+            )
+        return cursor.rowcount
 
     def get_pending_ids(self, limit: int = 100, offset: int = 0) -> list[str]:
         """Get message IDs with 'pending' status."""
-        rows = self.conn.execute(
-            "SELECT message_id FROM messages WHERE status = 'pending' "
-            "ORDER BY created_at LIMIT ? OFFSET ?",
-            (limit, offset),
-        ).fetchall()
-        return [row["message_id"] for row in rows]
+        return self._ids_by_status("pending", limit, offset)
 
     def get_fetched_ids(self, limit: int = 100, offset: int = 0) -> list[str]:
         """Get message IDs with 'fetched' status (ready for conversion)."""
-        rows = self.conn.execute(
-            "SELECT message_id FROM messages WHERE status = 'fetched' "
-            "ORDER BY created_at LIMIT ? OFFSET ?",
-            (limit, offset),
-        ).fetchall()
-        return [row["message_id"] for row in rows]
+        return self._ids_by_status("fetched", limit, offset)
+
+    def _ids_by_status(self, status: str, limit: int, offset: int) -> list[str]:
+        """Message IDs in one status, oldest first, read as plain tuples."""
+        cursor = self._tuple_cursor().execute(_SELECT_IDS_BY_STATUS_SQL, (status, limit, offset))
+        return [row[0] for row in cursor]
 
     def get_message(self, message_id: str) -> dict | None:
         """Get full message record by ID."""
@@ -223,15 +537,14 @@ class FetchTracker:
 
     def count_by_status(self) -> dict[str, int]:
         """Get count of messages grouped by status."""
-        rows = self.conn.execute(
-            "SELECT status, COUNT(*) as cnt FROM messages GROUP BY status"
-        ).fetchall()
-        return {row["status"]: row["cnt"] for row in rows}
+        # Plain tuple rows so the (status, count) pairs feed dict() directly
+        cursor = self._tuple_cursor()
+        return dict(cursor.execute("SELECT status, COUNT(*) FROM messages GROUP BY status"))
 
     def is_tracked(self, message_id: str) -> bool:
         """Check if a message ID is already tracked."""
         row = self.conn.execute(
-            "SELECT 1 FROM messages WHERE message_id = ?", (message_id,)
+            "SELECT 1 FROM messages WHERE message_id = ? LIMIT 1", (message_id,)
         ).fetchone()
         return row is not None
 
@@ -242,7 +555,6 @@ class FetchTracker:
             "INSERT INTO fetch_runs (label_id, started_at) VALUES (?, ?)",
             (label_id, now),
         )
-        self.conn.commit()
         return cursor.lastrowid or 0
 
     def complete_run(
@@ -262,7 +574,6 @@ class FetchTracker:
                WHERE run_id = ?""",
             (now, ids_discovered, messages_fetched, messages_converted, messages_failed, run_id),
         )
-        self.conn.commit()
 
     def upsert_labels(self, labels: list[dict[str, str]]) -> int:
         """Bulk upsert label ID → name mappings from Gmail API.
@@ -275,15 +586,15 @@ class FetchTracker:
         """
         now = datetime.now(UTC).isoformat()
         rows = [(lbl["id"], lbl["name"], now) for lbl in labels]
-        self.conn.executemany(
-            """INSERT INTO labels (label_id, label_name, updated_at)
-               VALUES (?, ?, ?)
-               ON CONFLICT(label_id) DO UPDATE SET
-                   label_name = excluded.label_name,
-                   updated_at = excluded.updated_at""",
-            rows,
-        )
-        self.conn.commit()
+        with self._tx() as conn:
+            conn.executemany(
+                """INSERT INTO labels (label_id, label_name, updated_at)
+                   VALUES (?, ?, ?)
+                   ON CONFLICT(label_id) DO UPDATE SET
+                       label_name = excluded.label_name,
+                       updated_at = excluded.updated_at""",
+                rows,
+            )
         return len(rows)
 
     def insert_message_labels(self, message_id: str, label_ids: tuple[str, ...]) -> None:
@@ -294,11 +605,11 @@ class FetchTracker:
             label_ids: Tuple of label IDs associated with the message.
         """
         rows = [(message_id, lid) for lid in label_ids]
-        self.conn.executemany(
-            "INSERT OR IGNORE INTO message_labels (message_id, label_id) VALUES (?, ?)",
-            rows,
-        )
-        self.conn.commit()
+        with self._tx() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO message_labels (message_id, label_id) VALUES (?, ?)",
+                rows,
+            )
 
     def get_message_labels(self, message_id: str) -> list[dict[str, str]]:
         """Get label IDs and names for a message via JOIN.
@@ -337,7 +648,6 @@ class FetchTracker:
                    updated_at = excluded.updated_at""",
             (label_id, history_id, now),
         )
-        self.conn.commit()
 
     def retry_failed(self) -> int:
         """Reset all 'failed' messages back to 'pending' for retry.
@@ -350,5 +660,4 @@ class FetchTracker:
             "WHERE status = 'failed'",
             (now,),
         )
-        self.conn.commit()
         return cursor.rowcount
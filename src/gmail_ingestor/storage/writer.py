@@ -8,15 +8,29 @@ import unicodedata
 from pathlib import Path
 
 from gmail_ingestor.core.models import ConvertedEmail
+from gmail_ingestor.storage.fileio import write_bytes
 
 logger = logging.getLogger(__name__)
 
+# Slug patterns, compiled once rather than looked up in re's cache per message
+_NON_SLUG_RE = re.compile(r"[^\w\s-]")
+_SEPARATOR_RE = re.compile(r"[-\s]+")
+
+# NFKD + ASCII fold precomputed for Latin-1 Supplement and Latin Extended-A,
+# which covers the accents seen in most subjects; characters that fold to
+# nothing map to None (deleted), exactly as encode("ascii", "ignore") would
+_ACCENT_MAP = {
+    cp: unicodedata.normalize("NFKD", chr(cp)).encode("ascii", "ignore").decode("ascii") or None
+    for cp in range(0xA0, 0x180)
+}
+
 
 class MarkdownWriter:
     """Write converted emails to markdown files with structured naming."""
 
     def __init__(self, output_dir: Path) -> None:
         self._output_dir = output_dir
+        # Created once here; write() relies on it and does no per-file checks
         self._output_dir.mkdir(parents=True, exist_ok=True)
 
     def write(self, email: ConvertedEmail) -> Path:
@@ -36,7 +50,7 @@ class MarkdownWriter:
         filename = f"{slug}_{short_id}.md"
 
         filepath = self._output_dir / filename
-        filepath.write_text(email.markdown, encoding="utf-8")
+        write_bytes(str(filepath), email.markdown.encode("utf-8"))
         logger.debug("Wrote markdown: %s", filepath)
 
         return filepath
@@ -52,9 +66,12 @@ class MarkdownWriter:
         Returns:
             Lowercase, hyphenated, ASCII-safe slug.
         """
-        # Normalize unicode characters
-        text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+        # Fold accents to ASCII: table lookup first, full NFKD only for what's left
+        if not text.isascii():
+            text = text.translate(_ACCENT_MAP)
+            if not text.isascii():
+                text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
         # Lowercase and replace non-alphanum with hyphens
-        text = re.sub(r"[^\w\s-]", "", text.lower())
-        text = re.sub(r"[-\s]+", "-", text).strip("-")
+        text = _NON_SLUG_RE.sub("", text.lower())
+        text = _SEPARATOR_RE.sub("-", text).strip("-")
         return text[:max_length] if text else "untitled"
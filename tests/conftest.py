@@ -14,37 +14,55 @@ from gmail_ingestor.core.models import EmailBody, EmailHeader, EmailMessage
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
 
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    """Deselect pytest-benchmark tests unless the run asks for them with --benchmark-only.
+
+    Done here rather than with --benchmark-skip in addopts, which would break
+    runs that disable plugin autoloading. Runs before pytest-benchmark's own
+    hook, so deselected benchmarks don't trigger its xdist warning.
+    """
+    if config.getoption("benchmark_only", default=False):
+        return
+    benchmarks = [item for item in items if "benchmark" in getattr(item, "fixturenames", ())]
+    if benchmarks:
+        config.hook.pytest_deselected(items=benchmarks)
+        items[:] = [item for item in items if item not in benchmarks]
+
+
 @pytest.fixture
 def fixtures_dir() -> Path:
     """Path to the test fixtures directory."""
     return FIXTURES_DIR
 
 
-@pytest.fixture
+# GmailParser.parse only reads the raw dicts, so they are loaded once per module
+@pytest.fixture(scope="module")
 def simple_text_raw() -> dict[str, Any]:
     """Raw Gmail API response for a simple text email."""
     return json.loads((FIXTURES_DIR / "simple_text.json").read_text())
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def simple_html_raw() -> dict[str, Any]:
     """Raw Gmail API response for a simple HTML email."""
     return json.loads((FIXTURES_DIR / "simple_html.json").read_text())
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def multipart_alt_raw() -> dict[str, Any]:
     """Raw Gmail API response for a multipart/alternative email."""
     return json.loads((FIXTURES_DIR / "multipart_alternative.json").read_text())
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def multipart_mixed_raw() -> dict[str, Any]:
     """Raw Gmail API response for a multipart/mixed email with attachment."""
     return json.loads((FIXTURES_DIR / "multipart_mixed.json").read_text())
 
 
-@pytest.fixture
+# The sample models are frozen dataclasses, so one instance per module is safe
+@pytest.fixture(scope="module")
 def sample_header() -> EmailHeader:
     """A sample parsed email header."""
     return EmailHeader(
@@ -57,7 +75,7 @@ def sample_header() -> EmailHeader:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_body_html() -> EmailBody:
     """A sample email body with both text and HTML."""
     return EmailBody(
@@ -66,13 +84,13 @@ def sample_body_html() -> EmailBody:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_body_text_only() -> EmailBody:
     """A sample email body with only plain text."""
     return EmailBody(plain_text="Hello, plain text only.", html=None)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_email(sample_header: EmailHeader, sample_body_html: EmailBody) -> EmailMessage:
     """A sample complete parsed email."""
     return EmailMessage(
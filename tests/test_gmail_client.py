@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import threading
 from typing import Any
 from unittest.mock import MagicMock, patch
 
 import pytest
+from googleapiclient.errors import HttpError
+from googleapiclient.http import BatchHttpRequest
 
 from gmail_ingestor.core.exceptions import GmailIngestorError, HistoryExpiredError, RateLimitError
 from gmail_ingestor.core.gmail_client import GmailClient, _is_rate_limit_error
@@ -40,8 +43,6 @@ class TestIsRateLimitError:
 
     def test_detects_http_error_429(self) -> None:
         """HttpError with status_code 429 is detected as rate limit."""
-        from googleapiclient.errors import HttpError
-
         exc = HttpError(resp=MagicMock(status=429), content=b"rate limit")
         assert _is_rate_limit_error(exc) is True
 
@@ -53,17 +54,35 @@ class TestIsRateLimitError:
         """Generic exception with 'rateLimitExceeded' is detected."""
         assert _is_rate_limit_error(Exception("rateLimitExceeded")) is True
 
+    def test_detects_user_rate_limit_exceeded_in_string(self) -> None:
+        """Generic exception with 'userRateLimitExceeded' is detected."""
+        assert _is_rate_limit_error(Exception("403 userRateLimitExceeded")) is True
+
+    def test_detects_quota_exceeded_in_string(self) -> None:
+        """Generic exception with 'quotaExceeded' is detected."""
+        assert _is_rate_limit_error(Exception("403 quotaExceeded")) is True
+
     def test_non_rate_limit_error(self) -> None:
         """Non-rate-limit errors return False."""
         assert _is_rate_limit_error(Exception("Server error 500")) is False
 
     def test_http_error_non_429(self) -> None:
         """HttpError with non-429 status is not a rate limit."""
-        from googleapiclient.errors import HttpError
-
         exc = HttpError(resp=MagicMock(status=500), content=b"server error")
         assert _is_rate_limit_error(exc) is False
 
+    def test_http_error_403_with_rate_limit_reason(self) -> None:
+        """HttpError 403 carrying a userRateLimitExceeded reason is a rate limit."""
+        exc = HttpError(
+            resp=MagicMock(status=403),
+            content=b'{"error": {"message": "userRateLimitExceeded"}}',
+        )
+        assert _is_rate_limit_error(exc) is True
+
+    def test_non_string_first_arg_falls_back_to_str(self) -> None:
+        """Exceptions whose first arg is not a string are still checked via str()."""
+        assert _is_rate_limit_error(Exception(429, "Too Many Requests")) is True
+
 
 # ---------- list_labels ----------
 
@@ -82,14 +101,18 @@ class TestListLabels:
                 {"id": "SENT", "name": "SENT", "type": "system"},
             ]
         }
+        mock_service.users.reset_mock()
 
         result = client.list_labels()
+        client.list_labels()
 
         assert result == [
             {"id": "INBOX", "name": "INBOX"},
             {"id": "Label_1", "name": "Work"},
             {"id": "SENT", "name": "SENT"},
         ]
+        # The users() resource is built on first use and reused afterwards
+        assert mock_service.users.call_count == 1
 
     def test_returns_empty_list_when_no_labels(
         self, client: GmailClient, mock_service: MagicMock
@@ -161,6 +184,21 @@ class TestExecuteWithRetry:
 
         mock_request.execute.assert_called_once_with(num_retries=7)
 
+    def test_batch_request_executes_without_num_retries(
+        self, mock_service: MagicMock
+    ) -> None:
+        """BatchHttpRequest.execute() is called without the num_retries kwarg."""
+        client = GmailClient(
+            mock_service, num_retries=7, initial_backoff_seconds=0.01,
+            max_retries=1, inter_page_delay_seconds=0,
+        )
+        mock_batch = MagicMock(spec=BatchHttpRequest)
+        mock_batch.execute.return_value = None
+
+        client._execute_with_retry(mock_batch, "test")
+
+        mock_batch.execute.assert_called_once_with()
+
     def test_exponential_backoff_increases(
         self, mock_service: MagicMock
     ) -> None:
@@ -183,11 +221,12 @@ class TestExecuteWithRetry:
         sleep_times: list[float] = []
 
         with patch("gmail_ingestor.core.gmail_client.time.sleep", side_effect=lambda t: sleep_times.append(t)):
-            with patch("gmail_ingestor.core.gmail_client.random.uniform", side_effect=lambda a, b: b):
+            with patch.object(client._rng, "uniform", side_effect=lambda a, b: b):
                 result = client._execute_with_retry(mock_request, "test")
 
         assert result == {"result": "ok"}
         # Backoff: 1.0, 2.0, 4.0 (all under max of 10.0)
+        assert client._backoff_schedule == (1.0, 2.0, 4.0)
         assert sleep_times == [1.0, 2.0, 4.0]
 
     def test_backoff_capped_at_max(
@@ -213,10 +252,11 @@ class TestExecuteWithRetry:
         sleep_times: list[float] = []
 
         with patch("gmail_ingestor.core.gmail_client.time.sleep", side_effect=lambda t: sleep_times.append(t)):
-            with patch("gmail_ingestor.core.gmail_client.random.uniform", side_effect=lambda a, b: b):
+            with patch.object(client._rng, "uniform", side_effect=lambda a, b: b):
                 client._execute_with_retry(mock_request, "test")
 
         # Backoff: 2.0, 4.0, 5.0 (capped), 5.0 (capped)
+        assert client._backoff_schedule == (2.0, 4.0, 5.0, 5.0)
         assert sleep_times == [2.0, 4.0, 5.0, 5.0]
 
     def test_jitter_applied(self, mock_service: MagicMock) -> None:
@@ -235,7 +275,7 @@ class TestExecuteWithRetry:
         ]
 
         with patch("gmail_ingestor.core.gmail_client.time.sleep") as mock_sleep:
-            with patch("gmail_ingestor.core.gmail_client.random.uniform", return_value=2.5):
+            with patch.object(client._rng, "uniform", return_value=2.5):
                 client._execute_with_retry(mock_request, "test")
 
         mock_sleep.assert_called_once_with(2.5)
@@ -324,6 +364,20 @@ class TestDiscoverMessageIds:
 
         assert pages == []
 
+    def test_follows_token_past_empty_page(
+        self, client: GmailClient, mock_service: MagicMock
+    ) -> None:
+        """An empty page that still carries nextPageToken does not end discovery."""
+        mock_list = mock_service.users().messages().list
+        mock_list.return_value.execute.side_effect = [
+            {"resultSizeEstimate": 0, "nextPageToken": "tok2"},
+            {"messages": [{"id": "msg1", "threadId": "t1"}]},
+        ]
+
+        pages = list(client.discover_message_ids("INBOX"))
+
+        assert pages == [[MessageStub(message_id="msg1", thread_id="t1")]]
+
     def test_retries_on_429_during_discovery(
         self, client: GmailClient, mock_service: MagicMock
     ) -> None:
@@ -391,13 +445,65 @@ class TestDiscoverMessageIds:
         mock_list = mock_service.users().messages().list
         mock_list.return_value.execute.side_effect = [page1, page2]
 
-        with patch("gmail_ingestor.core.gmail_client.time.sleep") as mock_sleep:
+        with (
+            patch("gmail_ingestor.core.gmail_client.time.sleep") as mock_sleep,
+            patch("gmail_ingestor.core.gmail_client.time.monotonic", return_value=100.0),
+        ):
             pages = list(client.discover_message_ids("INBOX"))
 
         assert len(pages) == 2
         # Sleep should be called once (between page 1 and 2, not before page 1)
         mock_sleep.assert_called_once_with(0.5)
 
+    def test_inter_page_delay_skipped_when_consumer_is_slow(
+        self, mock_service: MagicMock
+    ) -> None:
+        """No sleep is needed when the consumer already spent the delay on the page."""
+        client = GmailClient(
+            mock_service,
+            inter_page_delay_seconds=0.5,
+            max_retries=0,
+            initial_backoff_seconds=0.01,
+        )
+        page1 = {
+            "messages": [{"id": "msg1", "threadId": "t1"}],
+            "nextPageToken": "tok2",
+        }
+        page2 = {
+            "messages": [{"id": "msg2", "threadId": "t2"}],
+        }
+        mock_list = mock_service.users().messages().list
+        mock_list.return_value.execute.side_effect = [page1, page2]
+
+        # Deadline set at t=100.0; the next page is requested at t=101.0
+        with (
+            patch("gmail_ingestor.core.gmail_client.time.sleep") as mock_sleep,
+            patch(
+                "gmail_ingestor.core.gmail_client.time.monotonic",
+                side_effect=[100.0, 101.0, 101.2],
+            ),
+        ):
+            pages = list(client.discover_message_ids("INBOX"))
+
+        assert len(pages) == 2
+        mock_sleep.assert_not_called()
+
+    def test_builds_resource_chain_once_across_pages(self, mock_service: MagicMock) -> None:
+        """users() is resolved once per client, not once per discovery page."""
+        pages_responses = [
+            {"messages": [{"id": f"msg{i}", "threadId": f"t{i}"}], "nextPageToken": f"tok{i}"}
+            for i in range(4)
+        ]
+        pages_responses.append({"messages": [{"id": "msg4", "threadId": "t4"}]})
+        mock_service.users().messages().list.return_value.execute.side_effect = pages_responses
+        mock_service.users.reset_mock()
+
+        client = GmailClient(mock_service, inter_page_delay_seconds=0, num_retries=0)
+        pages = list(client.discover_message_ids("INBOX"))
+
+        assert len(pages) == 5
+        assert mock_service.users.call_count == 1
+
 
 # ---------- fetch_messages_batch ----------
 
@@ -427,6 +533,28 @@ class TestFetchMessagesBatch:
 
         assert result == [msg1, msg2]
 
+    @pytest.mark.parametrize("message_format", ["full", "raw"])
+    def test_requests_configured_format(
+        self, mock_service: MagicMock, message_format: str
+    ) -> None:
+        """Each messages.get in the batch uses the client's message_format."""
+        client = GmailClient(
+            mock_service, inter_page_delay_seconds=0, num_retries=0, message_format=message_format
+        )
+
+        def fake_new_batch(callback: Any) -> MagicMock:
+            batch = MagicMock()
+            batch.execute.side_effect = lambda: callback("msg1", {"id": "msg1"}, None)
+            return batch
+
+        mock_service.new_batch_http_request.side_effect = fake_new_batch
+
+        client.fetch_messages_batch(["msg1"])
+
+        mock_service.users().messages().get.assert_called_once_with(
+            userId="me", id="msg1", format=message_format
+        )
+
     def test_handles_batch_callback_errors(
         self, client: GmailClient, mock_service: MagicMock
     ) -> None:
@@ -453,20 +581,22 @@ class TestFetchMessagesBatch:
     def test_retries_batch_on_429_in_callback(
         self, client: GmailClient, mock_service: MagicMock
     ) -> None:
-        """fetch_messages_batch() retries entire batch when callback reports 429."""
+        """fetch_messages_batch() re-batches only the IDs whose callback reported 429."""
         msg1 = {"id": "msg1", "threadId": "t1", "payload": {}}
-        call_count = 0
+        msg2 = {"id": "msg2", "threadId": "t2", "payload": {}}
+        batches: list[MagicMock] = []
 
         def fake_new_batch(callback: Any) -> MagicMock:
-            nonlocal call_count
-            call_count += 1
             batch = MagicMock()
+            batches.append(batch)
+            first_call = len(batches) == 1
 
             def fake_execute() -> None:
-                if call_count == 1:
-                    callback("msg1", None, Exception("429 rateLimitExceeded"))
-                else:
+                if first_call:
                     callback("msg1", msg1, None)
+                    callback("msg2", None, Exception("429 rateLimitExceeded"))
+                else:
+                    callback("msg2", msg2, None)
 
             batch.execute.side_effect = fake_execute
             return batch
@@ -474,10 +604,46 @@ class TestFetchMessagesBatch:
         mock_service.new_batch_http_request.side_effect = fake_new_batch
 
         with patch("gmail_ingestor.core.gmail_client.time.sleep"):
-            result = client.fetch_messages_batch(["msg1"])
+            result = client.fetch_messages_batch(["msg1", "msg2"])
 
-        assert result == [msg1]
-        assert call_count == 2
+        assert result == [msg1, msg2]
+        assert len(batches) == 2
+        assert batches[0].add.call_count == 2
+        assert batches[1].add.call_count == 1
+        assert batches[1].add.call_args.kwargs["request_id"] == "msg2"
+
+    def test_batch_size_halves_after_429(
+        self, client: GmailClient, mock_service: MagicMock
+    ) -> None:
+        """A 429 in one chunk halves the size of the next chunk."""
+        message_ids = [f"msg{i}" for i in range(150)]
+        batches: list[MagicMock] = []
+
+        def fake_new_batch(callback: Any) -> MagicMock:
+            batch = MagicMock()
+            batches.append(batch)
+            first_call = len(batches) == 1
+
+            def fake_execute() -> None:
+                for add_call in batch.add.call_args_list:
+                    request_id = add_call.kwargs["request_id"]
+                    if first_call and request_id == "msg0":
+                        callback(request_id, None, Exception("429 rateLimitExceeded"))
+                    else:
+                        callback(request_id, {"id": request_id}, None)
+
+            batch.execute.side_effect = fake_execute
+            return batch
+
+        mock_service.new_batch_http_request.side_effect = fake_new_batch
+
+        with patch("gmail_ingestor.core.gmail_client.time.sleep"):
+            result = client.fetch_messages_batch(message_ids)
+
+        assert [r["id"] for r in result] == message_ids
+        # Chunk 1 (100 IDs), retry of the rate-limited ID, then chunk 2 at half size
+        assert [b.add.call_count for b in batches] == [100, 1, 50]
+        assert client._current_batch_size == 50
 
     def test_raises_rate_limit_after_exhausted_batch_retries(
         self, client: GmailClient, mock_service: MagicMock
@@ -542,6 +708,33 @@ class TestFetchMessagesBatch:
 
         assert result == [msg1]
 
+    def test_duplicate_ids_fetched_once(
+        self, client: GmailClient, mock_service: MagicMock
+    ) -> None:
+        """Duplicate IDs are collapsed before batching; request IDs must be unique."""
+        batches: list[MagicMock] = []
+
+        def fake_new_batch(callback: Any) -> MagicMock:
+            batch = MagicMock()
+            batches.append(batch)
+
+            def fake_execute() -> None:
+                request_ids = [c.kwargs["request_id"] for c in batch.add.call_args_list]
+                if len(request_ids) != len(set(request_ids)):
+                    raise KeyError("A request with this ID already exists")
+                for request_id in request_ids:
+                    callback(request_id, {"id": request_id}, None)
+
+            batch.execute.side_effect = fake_execute
+            return batch
+
+        mock_service.new_batch_http_request.side_effect = fake_new_batch
+
+        result = client.fetch_messages_batch(["msg1", "msg2", "msg1"])
+
+        assert [r["id"] for r in result] == ["msg1", "msg2"]
+        assert [b.add.call_count for b in batches] == [2]
+
     def test_returns_empty_list_for_empty_input(
         self, client: GmailClient, mock_service: MagicMock
     ) -> None:
@@ -557,6 +750,129 @@ class TestFetchMessagesBatch:
         result = client.fetch_messages_batch([])
 
         assert result == []
+        assert mock_service.new_batch_http_request.call_count == 0
+
+
+# ---------- stream_messages ----------
+
+
+def _echo_batch(callback: Any) -> MagicMock:
+    """Fake BatchHttpRequest answering every added request with {"id": request_id}."""
+    batch = MagicMock()
+
+    def fake_execute() -> None:
+        for add_call in batch.add.call_args_list:
+            request_id = add_call.kwargs["request_id"]
+            callback(request_id, {"id": request_id}, None)
+
+    batch.execute.side_effect = fake_execute
+    return batch
+
+
+class TestStreamMessages:
+    """Tests for GmailClient.stream_messages()."""
+
+    def test_fuses_discovery_pages_into_fetched_messages_in_order(
+        self, client: GmailClient, mock_service: MagicMock
+    ) -> None:
+        """Each discovered page is batch fetched and yielded in discovery order."""
+        mock_list = mock_service.users().messages().list
+        mock_list.return_value.execute.side_effect = [
+            {
+                "messages": [{"id": "msg1", "threadId": "t1"}, {"id": "msg2", "threadId": "t2"}],
+                "nextPageToken": "tok2",
+            },
+            {"messages": [{"id": "msg3", "threadId": "t3"}]},
+        ]
+        mock_service.new_batch_http_request.side_effect = _echo_batch
+
+        result = list(client.stream_messages("INBOX"))
+
+        assert [msg["id"] for msg in result] == ["msg1", "msg2", "msg3"]
+        assert mock_service.new_batch_http_request.call_count == 2
+
+    def test_discovery_thread_uses_its_own_service(self, mock_service: MagicMock) -> None:
+        """With a service_factory, list calls go through the factory's service."""
+        discovery_service = MagicMock()
+        discovery_service.users().messages().list.return_value.execute.side_effect = [
+            {"messages": [{"id": "msg1", "threadId": "t1"}], "nextPageToken": "tok2"},
+            {"messages": [{"id": "msg2", "threadId": "t2"}]},
+        ]
+        mock_service.new_batch_http_request.side_effect = _echo_batch
+        client = GmailClient(
+            mock_service,
+            inter_page_delay_seconds=0,
+            num_retries=0,
+            service_factory=lambda: discovery_service,
+        )
+
+        result = list(client.stream_messages("INBOX"))
+
+        assert [msg["id"] for msg in result] == ["msg1", "msg2"]
+        mock_service.users().messages().list.assert_not_called()
+
+    def test_discovery_thread_stops_when_consumer_quits_early(
+        self, mock_service: MagicMock
+    ) -> None:
+        """Closing the stream early ends the discovery thread before it lists more pages."""
+        discovery_service = MagicMock()
+        mock_list = discovery_service.users().messages().list
+        mock_list.return_value.execute.side_effect = lambda **_: {
+            "messages": [{"id": f"msg{mock_list.call_count}", "threadId": "t"}],
+            "nextPageToken": "more",
+        }
+        mock_service.new_batch_http_request.side_effect = _echo_batch
+        producers: list[threading.Thread] = []
+
+        def service_factory() -> MagicMock:
+            producers.append(threading.current_thread())
+            return discovery_service
+
+        client = GmailClient(
+            mock_service,
+            inter_page_delay_seconds=0,
+            num_retries=0,
+            service_factory=service_factory,
+        )
+
+        stream = client.stream_messages("INBOX")
+        next(stream)
+        stream.close()
+        [producer] = producers
+        producer.join(timeout=5)
+        calls_at_exit = mock_list.call_count
+
+        assert producer is not threading.current_thread()
+        assert not producer.is_alive()
+        # One page consumed, at most two queued and one in flight when stop was set
+        assert calls_at_exit <= 4
+        assert mock_list.call_count == calls_at_exit
+
+    def test_propagates_discovery_thread_errors(self, mock_service: MagicMock) -> None:
+        """Errors raised on the discovery thread surface in the consumer."""
+        discovery_service = MagicMock()
+        discovery_service.users().messages().list().execute.side_effect = Exception(
+            "Server error 500"
+        )
+        client = GmailClient(
+            mock_service,
+            inter_page_delay_seconds=0,
+            num_retries=0,
+            service_factory=lambda: discovery_service,
+        )
+
+        with pytest.raises(GmailIngestorError, match="Failed to discover messages"):
+            list(client.stream_messages("INBOX"))
+        mock_service.new_batch_http_request.assert_not_called()
+
+    def test_propagates_discovery_errors_without_factory(
+        self, client: GmailClient, mock_service: MagicMock
+    ) -> None:
+        """Without a service_factory, discovery errors raise on the calling thread."""
+        mock_service.users().messages().list().execute.side_effect = Exception("Server error 500")
+
+        with pytest.raises(GmailIngestorError, match="Failed to discover messages"):
+            list(client.stream_messages("INBOX"))
 
 
 # ---------- get_profile_history_id ----------
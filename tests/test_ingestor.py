@@ -2,15 +2,19 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable, Iterator
+from dataclasses import replace
 from datetime import datetime
 from pathlib import Path
 from typing import Any
-from unittest.mock import MagicMock, call, patch
+from unittest.mock import Mock, call, patch
 
 import pytest
 
 from gmail_ingestor.config.settings import GmailIngestorSettings
+from gmail_ingestor.core.converter import MarkdownConverter
 from gmail_ingestor.core.exceptions import ConversionError, RateLimitError
+from gmail_ingestor.core.gmail_client import GmailClient
 from gmail_ingestor.core.models import (
     ConvertedEmail,
     EmailBody,
@@ -19,12 +23,21 @@ from gmail_ingestor.core.models import (
     FetchProgress,
     MessageStub,
 )
+from gmail_ingestor.core.parser import GmailParser
 from gmail_ingestor.pipeline.ingestor import EmailIngestor
+from gmail_ingestor.storage.raw_store import RawEmailStore
+from gmail_ingestor.storage.tracker import FetchTracker
+from gmail_ingestor.storage.writer import MarkdownWriter
 
+# Everything below is mocked; third-party deprecation noise from the real
+# imports above is not actionable here
+pytestmark = pytest.mark.filterwarnings("ignore::DeprecationWarning")
 
-@pytest.fixture
-def tmp_settings(tmp_path: Path) -> GmailIngestorSettings:
-    """Settings pointing to temporary directories."""
+
+@pytest.fixture(scope="module")
+def tmp_settings(tmp_path_factory: pytest.TempPathFactory) -> GmailIngestorSettings:
+    """Settings pointing to temporary directories, shared across the module."""
+    tmp_path = tmp_path_factory.mktemp("ingestor")
     return GmailIngestorSettings(
         credentials_path=tmp_path / "creds" / "client_secret.json",
         token_path=tmp_path / "creds" / "token.json",
@@ -37,82 +50,234 @@ def tmp_settings(tmp_path: Path) -> GmailIngestorSettings:
     )
 
 
-@pytest.fixture
-def mock_gmail_client() -> MagicMock:
-    """Mocked GmailClient."""
-    client = MagicMock()
-    # Default historyId returned before discovery
-    client.get_profile_history_id.return_value = "12345"
-    return client
+@pytest.fixture(scope="module")
+def mock_gmail_client() -> Mock:
+    """Mocked GmailClient, shared across the module and reset per test."""
+    return Mock(spec=GmailClient)
 
 
-@pytest.fixture
-def mock_parser() -> MagicMock:
+@pytest.fixture(scope="module")
+def mock_parser() -> Mock:
     """Mocked GmailParser."""
-    return MagicMock()
+    return Mock(spec=GmailParser)
 
 
-@pytest.fixture
-def mock_converter() -> MagicMock:
+@pytest.fixture(scope="module")
+def mock_converter() -> Mock:
     """Mocked MarkdownConverter."""
-    return MagicMock()
+    return Mock(spec=MarkdownConverter)
 
 
-@pytest.fixture
-def mock_tracker() -> MagicMock:
-    """Mocked FetchTracker."""
-    tracker = MagicMock()
-    tracker.start_run.return_value = 1
-    # Default: no stored historyId (first run → full discovery)
-    tracker.get_history_id.return_value = None
-    return tracker
+@pytest.fixture(scope="module")
+def mock_tracker() -> Mock:
+    """Mocked FetchTracker, shared across the module and reset per test."""
+    return Mock(spec=FetchTracker)
 
 
-@pytest.fixture
-def mock_raw_store() -> MagicMock:
+@pytest.fixture(scope="module")
+def mock_raw_store() -> Mock:
     """Mocked RawEmailStore."""
-    return MagicMock()
+    return Mock(spec=RawEmailStore)
 
 
-@pytest.fixture
-def mock_writer() -> MagicMock:
+@pytest.fixture(scope="module")
+def mock_writer() -> Mock:
     """Mocked MarkdownWriter."""
-    return MagicMock()
+    return Mock(spec=MarkdownWriter)
+
+
+@pytest.fixture(autouse=True)
+def _reset_mocks(
+    mock_gmail_client: Mock,
+    mock_parser: Mock,
+    mock_converter: Mock,
+    mock_tracker: Mock,
+    mock_raw_store: Mock,
+    mock_writer: Mock,
+) -> None:
+    """Clear calls, return values and side effects left over by the previous test.
+
+    The component mocks are module-scoped to avoid rebuilding the mock
+    graph for every test, so per-test defaults are re-applied here.
+    """
+    for mock in (
+        mock_gmail_client, mock_parser, mock_converter,
+        mock_tracker, mock_raw_store, mock_writer,
+    ):
+        mock.reset_mock(return_value=True, side_effect=True)
+
+    # Default historyId returned before discovery
+    mock_gmail_client.get_profile_history_id.return_value = "12345"
+    mock_tracker.start_run.return_value = 1
+    # Default: no stored historyId (first run → full discovery)
+    mock_tracker.get_history_id.return_value = None
+    # Spec'd Mocks aren't iterable, so give label hydration a real list
+    mock_tracker.get_message_labels.return_value = ()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _patch_auth() -> Iterator[None]:
+    """Patch authenticate/build_gmail_service once for the whole module.
+
+    Keeps _ensure_initialized() from attempting real OAuth should a test
+    ever leave a component unset. Module rather than session scope so the
+    patch is undone before other test modules run.
+    """
+    with (
+        patch("gmail_ingestor.pipeline.ingestor.authenticate", return_value=Mock()),
+        patch("gmail_ingestor.pipeline.ingestor.build_gmail_service", return_value=Mock()),
+    ):
+        yield
+
+
+# Sample models shared across tests. They are frozen, so tests that need a
+# variant derive one with dataclasses.replace() instead of mutating these.
+_HEADER = EmailHeader(
+    subject="Test",
+    sender="sender@example.com",
+    to="to@example.com",
+    date=datetime(2024, 6, 15, 12, 0, 0),
+)
+_BODY = EmailBody(plain_text="Hello world", html=None)
+_EMAIL1 = EmailMessage(message_id="msg1", thread_id="t1", header=_HEADER, body=_BODY)
+_EMAIL2 = EmailMessage(message_id="msg2", thread_id="t2", header=_HEADER, body=_BODY)
+_CONVERTED = ConvertedEmail(
+    message_id="msg1",
+    markdown="---\nsubject: Test\n---\nHello world",
+    header=_HEADER,
+)
+
+
+def _stubs(start: int, stop: int) -> list[MessageStub]:
+    """MessageStubs m{start}..m{stop - 1} with matching t{i} thread IDs."""
+    return [MessageStub(message_id=f"m{i}", thread_id=f"t{i}") for i in range(start, stop)]
+
+
+def _rows(start: int, stop: int) -> list[tuple[str, str]]:
+    """The (message_id, thread_id) rows bulk_insert_pending() receives for _stubs()."""
+    return [(f"m{i}", f"t{i}") for i in range(start, stop)]
+
+
+def _calls_with_status(update_status: Mock, status: str) -> list[Any]:
+    """The update_status() calls that moved a message to ``status``."""
+    return [c for c in update_status.call_args_list if c.args[1] == status]
+
+
+def _record_progress(
+    counter: str,
+) -> tuple[list[tuple[str, int]], Callable[[FetchProgress], None]]:
+    """Build an on_progress callback recording ``(stage, counter)`` per tick.
+
+    FetchProgress is mutated in place, so only the two values a test
+    asserts on are copied out.
+
+    Returns:
+        The list the callback appends to, and the callback itself.
+    """
+    updates: list[tuple[str, int]] = []
+
+    def capture(progress: FetchProgress) -> None:
+        updates.append((progress.current_stage, getattr(progress, counter)))
+
+    return updates, capture
+
+
+def _parse_stub(raw_msg: dict[str, Any]) -> EmailMessage:
+    """Parser side effect returning _EMAIL1 re-keyed to the raw message's ID."""
+    return replace(_EMAIL1, message_id=raw_msg["id"])
 
 
 def _build_ingestor(
     settings: GmailIngestorSettings,
-    gmail_client: MagicMock,
-    parser: MagicMock,
-    converter: MagicMock,
-    tracker: MagicMock,
-    raw_store: MagicMock,
-    writer: MagicMock,
+    gmail_client: Mock,
+    parser: Mock,
+    converter: Mock,
+    tracker: Mock,
+    raw_store: Mock,
+    writer: Mock,
     on_progress: Any = None,
 ) -> EmailIngestor:
-    """Build an EmailIngestor with all internal components replaced by mocks.
+    """Build an EmailIngestor with all internal components replaced by mocks."""
+    ingestor = EmailIngestor(settings=settings, on_progress=on_progress)
+
+    # Replace lazy components with mocks
+    ingestor._client = gmail_client
+    ingestor._parser = parser
+    ingestor._converter = converter
+    ingestor._tracker = tracker
+    ingestor._raw_store = raw_store
+    ingestor._writer = writer
+
+    return ingestor
+
+
+@pytest.fixture(scope="module")
+def shared_ingestor(
+    tmp_settings: GmailIngestorSettings,
+    mock_gmail_client: Mock,
+    mock_parser: Mock,
+    mock_converter: Mock,
+    mock_tracker: Mock,
+    mock_raw_store: Mock,
+    mock_writer: Mock,
+) -> EmailIngestor:
+    """One EmailIngestor for the whole module, wired to the module's mocks.
 
-    We patch authenticate/build_gmail_service so _ensure_initialized() doesn't
-    attempt real OAuth, then override the lazy-init components directly.
+    Only its progress and callback change between tests; make_ingestor()
+    resets both.
+    """
+    return _build_ingestor(
+        tmp_settings,
+        mock_gmail_client,
+        mock_parser,
+        mock_converter,
+        mock_tracker,
+        mock_raw_store,
+        mock_writer,
+    )
+
+
+@pytest.fixture
+def make_ingestor(
+    shared_ingestor: EmailIngestor,
+    mock_gmail_client: Mock,
+    mock_parser: Mock,
+    mock_converter: Mock,
+    mock_tracker: Mock,
+    mock_raw_store: Mock,
+    mock_writer: Mock,
+) -> Callable[..., EmailIngestor]:
+    """Factory for an EmailIngestor wired to the module's mocks.
+
+    Accepts optional ``settings`` and ``on_progress``. Without custom settings
+    the shared ingestor is reset and returned instead of building a new one.
     """
-    with (
-        patch("gmail_ingestor.pipeline.ingestor.authenticate") as mock_auth,
-        patch("gmail_ingestor.pipeline.ingestor.build_gmail_service") as mock_build,
-    ):
-        mock_auth.return_value = MagicMock()
-        mock_build.return_value = MagicMock()
 
-        ingestor = EmailIngestor(settings=settings, on_progress=on_progress)
+    def _make(
+        settings: GmailIngestorSettings | None = None, on_progress: Any = None
+    ) -> EmailIngestor:
+        if settings is not None:
+            return _build_ingestor(
+                settings,
+                mock_gmail_client,
+                mock_parser,
+                mock_converter,
+                mock_tracker,
+                mock_raw_store,
+                mock_writer,
+                on_progress=on_progress,
+            )
+        shared_ingestor._progress = FetchProgress()
+        shared_ingestor.on_progress = on_progress
+        return shared_ingestor
 
-        # Replace lazy components with mocks
-        ingestor._client = gmail_client
-        ingestor._parser = parser
-        ingestor._converter = converter
-        ingestor._tracker = tracker
-        ingestor._raw_store = raw_store
-        ingestor._writer = writer
+    return _make
 
-    return ingestor
+
+@pytest.fixture
+def ingestor(make_ingestor: Callable[..., EmailIngestor]) -> EmailIngestor:
+    """The shared EmailIngestor, reset for the current test."""
+    return make_ingestor()
 
 
 # ---------- run_discovery ----------
@@ -123,13 +288,9 @@ class TestRunDiscovery:
 
     def test_inserts_pending_messages_from_paginated_discovery(
         self,
-        tmp_settings: GmailIngestorSettings,
-        mock_gmail_client: MagicMock,
-        mock_parser: MagicMock,
-        mock_converter: MagicMock,
-        mock_tracker: MagicMock,
-        mock_raw_store: MagicMock,
-        mock_writer: MagicMock,
+        ingestor: EmailIngestor,
+        mock_gmail_client: Mock,
+        mock_tracker: Mock,
     ) -> None:
         """run_discovery() iterates pages from GmailClient and bulk-inserts into tracker."""
         page1 = [
@@ -140,49 +301,26 @@ class TestRunDiscovery:
             MessageStub(message_id="msg3", thread_id="t3"),
         ]
         mock_gmail_client.discover_message_ids.return_value = iter([page1, page2])
-        mock_tracker.bulk_insert_pending.side_effect = [2, 1]
-
-        ingestor = _build_ingestor(
-            tmp_settings,
-            mock_gmail_client,
-            mock_parser,
-            mock_converter,
-            mock_tracker,
-            mock_raw_store,
-            mock_writer,
-        )
+        mock_tracker.bulk_insert_pending.side_effect = (2, 1)
 
         total_new = ingestor.run_discovery("INBOX")
 
         assert total_new == 3
-        assert mock_tracker.bulk_insert_pending.call_count == 2
-        mock_tracker.bulk_insert_pending.assert_any_call([("msg1", "t1"), ("msg2", "t2")], "INBOX")
-        mock_tracker.bulk_insert_pending.assert_any_call([("msg3", "t3")], "INBOX")
+        assert mock_tracker.bulk_insert_pending.call_args_list == [
+            call([("msg1", "t1"), ("msg2", "t2")], "INBOX"),
+            call([("msg3", "t3")], "INBOX"),
+        ]
         assert ingestor._progress.ids_discovered == 3
 
     def test_returns_zero_when_no_messages_discovered(
         self,
-        tmp_settings: GmailIngestorSettings,
-        mock_gmail_client: MagicMock,
-        mock_parser: MagicMock,
-        mock_converter: MagicMock,
-        mock_tracker: MagicMock,
-        mock_raw_store: MagicMock,
-        mock_writer: MagicMock,
+        ingestor: EmailIngestor,
+        mock_gmail_client: Mock,
+        mock_tracker: Mock,
     ) -> None:
         """run_discovery() returns 0 when no pages are yielded."""
         mock_gmail_client.discover_message_ids.return_value = iter([])
 
-        ingestor = _build_ingestor(
-            tmp_settings,
-            mock_gmail_client,
-            mock_parser,
-            mock_converter,
-            mock_tracker,
-            mock_raw_store,
-            mock_writer,
-        )
-
         total_new = ingestor.run_discovery("INBOX")
 
         assert total_new == 0
@@ -197,13 +335,9 @@ class TestIncrementalDiscovery:
 
     def test_uses_incremental_when_history_id_stored(
         self,
-        tmp_settings: GmailIngestorSettings,
-        mock_gmail_client: MagicMock,
-        mock_parser: MagicMock,
-        mock_converter: MagicMock,
-        mock_tracker: MagicMock,
-        mock_raw_store: MagicMock,
-        mock_writer: MagicMock,
+        ingestor: EmailIngestor,
+        mock_gmail_client: Mock,
+        mock_tracker: Mock,
     ) -> None:
         """When historyId exists, uses incremental discovery via history.list."""
         mock_tracker.get_history_id.return_value = "50000"
@@ -211,11 +345,6 @@ class TestIncrementalDiscovery:
         mock_gmail_client.discover_message_ids_incremental.return_value = iter([page])
         mock_tracker.bulk_insert_pending.return_value = 1
 
-        ingestor = _build_ingestor(
-            tmp_settings, mock_gmail_client, mock_parser, mock_converter,
-            mock_tracker, mock_raw_store, mock_writer,
-        )
-
         total = ingestor.run_discovery("INBOX")
 
         assert total == 1
@@ -229,13 +358,9 @@ class TestIncrementalDiscovery:
 
     def test_falls_back_to_full_on_expired_history(
         self,
-        tmp_settings: GmailIngestorSettings,
-        mock_gmail_client: MagicMock,
-        mock_parser: MagicMock,
-        mock_converter: MagicMock,
-        mock_tracker: MagicMock,
-        mock_raw_store: MagicMock,
-        mock_writer: MagicMock,
+        ingestor: EmailIngestor,
+        mock_gmail_client: Mock,
+        mock_tracker: Mock,
     ) -> None:
         """Falls back to full discovery when historyId is expired (HistoryExpiredError)."""
         from gmail_ingestor.core.exceptions import HistoryExpiredError
@@ -249,11 +374,6 @@ class TestIncrementalDiscovery:
         mock_gmail_client.discover_message_ids.return_value = iter([page])
         mock_tracker.bulk_insert_pending.return_value = 1
 
-        ingestor = _build_ingestor(
-            tmp_settings, mock_gmail_client, mock_parser, mock_converter,
-            mock_tracker, mock_raw_store, mock_writer,
-        )
-
         total = ingestor.run_discovery("INBOX")
 
         assert total == 1
@@ -265,23 +385,14 @@ class TestIncrementalDiscovery:
 
     def test_full_sync_when_query_set(
         self,
-        tmp_settings: GmailIngestorSettings,
-        mock_gmail_client: MagicMock,
-        mock_parser: MagicMock,
-        mock_converter: MagicMock,
-        mock_tracker: MagicMock,
-        mock_raw_store: MagicMock,
-        mock_writer: MagicMock,
+        ingestor: EmailIngestor,
+        mock_gmail_client: Mock,
+        mock_tracker: Mock,
     ) -> None:
         """Query parameter forces full discovery (history API doesn't support queries)."""
         mock_tracker.get_history_id.return_value = "50000"
         mock_gmail_client.discover_message_ids.return_value = iter([])
 
-        ingestor = _build_ingestor(
-            tmp_settings, mock_gmail_client, mock_parser, mock_converter,
-            mock_tracker, mock_raw_store, mock_writer,
-        )
-
         ingestor.run_discovery("INBOX", query="from:test@example.com")
 
         # Should use full discovery, not incremental
@@ -290,23 +401,14 @@ class TestIncrementalDiscovery:
 
     def test_force_full_sync_flag(
         self,
-        tmp_settings: GmailIngestorSettings,
-        mock_gmail_client: MagicMock,
-        mock_parser: MagicMock,
-        mock_converter: MagicMock,
-        mock_tracker: MagicMock,
-        mock_raw_store: MagicMock,
-        mock_writer: MagicMock,
+        ingestor: EmailIngestor,
+        mock_gmail_client: Mock,
+        mock_tracker: Mock,
     ) -> None:
         """force_full_sync=True bypasses stored historyId."""
         mock_tracker.get_history_id.return_value = "50000"
         mock_gmail_client.discover_message_ids.return_value = iter([])
 
-        ingestor = _build_ingestor(
-            tmp_settings, mock_gmail_client, mock_parser, mock_converter,
-            mock_tracker, mock_raw_store, mock_writer,
-        )
-
         ingestor.run_discovery("INBOX", force_full_sync=True)
 
         mock_gmail_client.discover_message_ids.assert_called_once()
@@ -316,23 +418,14 @@ class TestIncrementalDiscovery:
 
     def test_stores_history_id_on_first_run(
         self,
-        tmp_settings: GmailIngestorSettings,
-        mock_gmail_client: MagicMock,
-        mock_parser: MagicMock,
-        mock_converter: MagicMock,
-        mock_tracker: MagicMock,
-        mock_raw_store: MagicMock,
-        mock_writer: MagicMock,
+        ingestor: EmailIngestor,
+        mock_gmail_client: Mock,
+        mock_tracker: Mock,
     ) -> None:
         """First run (no stored historyId) does full discovery and stores historyId."""
         mock_tracker.get_history_id.return_value = None
         mock_gmail_client.discover_message_ids.return_value = iter([])
 
-        ingestor = _build_ingestor(
-            tmp_settings, mock_gmail_client, mock_parser, mock_converter,
-            mock_tracker, mock_raw_store, mock_writer,
-        )
-
         ingestor.run_discovery("INBOX")
 
         mock_gmail_client.discover_message_ids.assert_called_once()
@@ -340,24 +433,15 @@ class TestIncrementalDiscovery:
 
     def test_history_id_not_stored_when_profile_fails(
         self,
-        tmp_settings: GmailIngestorSettings,
-        mock_gmail_client: MagicMock,
-        mock_parser: MagicMock,
-        mock_converter: MagicMock,
-        mock_tracker: MagicMock,
-        mock_raw_store: MagicMock,
-        mock_writer: MagicMock,
+        ingestor: EmailIngestor,
+        mock_gmail_client: Mock,
+        mock_tracker: Mock,
     ) -> None:
         """historyId is not stored if get_profile_history_id fails."""
         mock_tracker.get_history_id.return_value = None
         mock_gmail_client.get_profile_history_id.side_effect = Exception("API error")
         mock_gmail_client.discover_message_ids.return_value = iter([])
 
-        ingestor = _build_ingestor(
-            tmp_settings, mock_gmail_client, mock_parser, mock_converter,
-            mock_tracker, mock_raw_store, mock_writer,
-        )
-
         ingestor.run_discovery("INBOX")
 
         mock_tracker.set_history_id.assert_not_called()
@@ -369,101 +453,62 @@ class TestIncrementalDiscovery:
 class TestRunFetchPending:
     """Tests for EmailIngestor.run_fetch_pending()."""
 
-    def test_fetches_parses_stores_and_marks_fetched(
+    @pytest.mark.parametrize(
+        (
+            "parse_side_effect",
+            "expected_total",
+            "expected_failed",
+            "expected_status",
+            "expected_detail",
+        ),
+        [
+            pytest.param((_EMAIL1, _EMAIL2), 2, 0, "fetched", "/tmp/msg.txt", id="parsed"),
+            pytest.param(
+                Exception("MIME decode error"), 0, 2, "failed", "MIME decode error",
+                id="parse_error",
+            ),
+        ],
+    )
+    def test_fetch_pending_outcomes(
         self,
-        tmp_settings: GmailIngestorSettings,
-        mock_gmail_client: MagicMock,
-        mock_parser: MagicMock,
-        mock_converter: MagicMock,
-        mock_tracker: MagicMock,
-        mock_raw_store: MagicMock,
-        mock_writer: MagicMock,
+        ingestor: EmailIngestor,
+        mock_gmail_client: Mock,
+        mock_parser: Mock,
+        mock_tracker: Mock,
+        mock_raw_store: Mock,
+        parse_side_effect: Any,
+        expected_total: int,
+        expected_failed: int,
+        expected_status: str,
+        expected_detail: str,
     ) -> None:
-        """run_fetch_pending() fetches messages, parses, stores raw, and marks fetched."""
+        """run_fetch_pending() stores and marks fetched, or marks failed when parsing raises."""
         # Tracker yields one batch of pending IDs then empty
-        mock_tracker.get_pending_ids.side_effect = [["msg1", "msg2"], []]
+        mock_tracker.get_pending_ids.side_effect = (("msg1", "msg2"), ())
 
         raw_msg1 = {"id": "msg1", "threadId": "t1", "payload": {}}
         raw_msg2 = {"id": "msg2", "threadId": "t2", "payload": {}}
-        mock_gmail_client.fetch_messages_batch.return_value = [raw_msg1, raw_msg2]
-
-        header = EmailHeader(
-            subject="Test",
-            sender="sender@example.com",
-            to="to@example.com",
-            date=datetime(2024, 6, 15, 12, 0, 0),
-        )
-        body = EmailBody(plain_text="Hello world", html=None)
-        email1 = EmailMessage(message_id="msg1", thread_id="t1", header=header, body=body)
-        email2 = EmailMessage(message_id="msg2", thread_id="t2", header=header, body=body)
-        mock_parser.parse.side_effect = [email1, email2]
+        mock_gmail_client.fetch_messages_batch.return_value = (raw_msg1, raw_msg2)
 
+        mock_parser.parse.side_effect = parse_side_effect
         mock_raw_store.store.return_value = {"text": Path("/tmp/msg.txt")}
 
-        # get_message returns None for IDs not in fetched set (not needed here
-        # since all are fetched, but tracker.get_message may be called for
-        # unmatched pending IDs)
-        mock_tracker.get_message.return_value = None
-
-        ingestor = _build_ingestor(
-            tmp_settings,
-            mock_gmail_client,
-            mock_parser,
-            mock_converter,
-            mock_tracker,
-            mock_raw_store,
-            mock_writer,
-        )
+        # As with a real tracker, a message that failed to parse is already
+        # stored as failed, so the missing-from-batch sweep must not count it
+        # a second time
+        mock_tracker.get_message.return_value = {"status": expected_status}
 
         total = ingestor.run_fetch_pending()
 
-        assert total == 2
+        assert total == expected_total
         assert mock_parser.parse.call_count == 2
-        assert mock_raw_store.store.call_count == 2
-        # Both messages should be marked as fetched
-        fetched_calls = [
-            c for c in mock_tracker.update_status.call_args_list if c[0][1] == "fetched"
-        ]
-        assert len(fetched_calls) == 2
-        assert ingestor._progress.messages_fetched == 2
-
-    def test_failed_messages_tracked_with_error(
-        self,
-        tmp_settings: GmailIngestorSettings,
-        mock_gmail_client: MagicMock,
-        mock_parser: MagicMock,
-        mock_converter: MagicMock,
-        mock_tracker: MagicMock,
-        mock_raw_store: MagicMock,
-        mock_writer: MagicMock,
-    ) -> None:
-        """run_fetch_pending() marks messages as failed when parsing raises."""
-        mock_tracker.get_pending_ids.side_effect = [["msg1"], []]
-
-        raw_msg1 = {"id": "msg1", "threadId": "t1", "payload": {}}
-        mock_gmail_client.fetch_messages_batch.return_value = [raw_msg1]
-
-        mock_parser.parse.side_effect = Exception("MIME decode error")
-        mock_tracker.get_message.return_value = None
-
-        ingestor = _build_ingestor(
-            tmp_settings,
-            mock_gmail_client,
-            mock_parser,
-            mock_converter,
-            mock_tracker,
-            mock_raw_store,
-            mock_writer,
-        )
-
-        total = ingestor.run_fetch_pending()
-
-        assert total == 0
-        # Message should be marked as failed
-        failed_calls = [c for c in mock_tracker.update_status.call_args_list if c[0][1] == "failed"]
-        assert len(failed_calls) >= 1
-        assert "MIME decode error" in str(failed_calls[0])
-        assert ingestor._progress.messages_failed >= 1
+        assert mock_raw_store.store.call_count == expected_total
+        # Both messages should carry the expected status
+        status_calls = _calls_with_status(mock_tracker.update_status, expected_status)
+        assert {c.args[0] for c in status_calls} == {"msg1", "msg2"}
+        assert expected_detail in str(status_calls[0])
+        assert ingestor._progress.messages_fetched == expected_total
+        assert ingestor._progress.messages_failed == expected_failed
 
 
 # ---------- run_convert_pending ----------
@@ -472,118 +517,90 @@ class TestRunFetchPending:
 class TestRunConvertPending:
     """Tests for EmailIngestor.run_convert_pending()."""
 
-    def test_converts_fetched_to_markdown_and_writes_files(
+    @pytest.mark.parametrize(
+        ("convert_side_effect", "expected_total", "expected_status", "expected_detail"),
+        [
+            pytest.param(None, 1, "converted", "2024-06-15_test_msg1.md", id="converted"),
+            pytest.param(
+                ConversionError("No convertible content"), 0, "failed",
+                "No convertible content", id="conversion_error",
+            ),
+        ],
+    )
+    def test_convert_pending_outcomes(
         self,
-        tmp_settings: GmailIngestorSettings,
-        mock_gmail_client: MagicMock,
-        mock_parser: MagicMock,
-        mock_converter: MagicMock,
-        mock_tracker: MagicMock,
-        mock_raw_store: MagicMock,
-        mock_writer: MagicMock,
-        tmp_path: Path,
+        ingestor: EmailIngestor,
+        mock_converter: Mock,
+        mock_tracker: Mock,
+        mock_writer: Mock,
+        convert_side_effect: Exception | None,
+        expected_total: int,
+        expected_status: str,
+        expected_detail: str,
     ) -> None:
-        """run_convert_pending() reads raw, converts, writes markdown, and marks converted."""
+        """run_convert_pending() writes markdown and marks converted, or failed on error."""
         # Tracker returns one batch of fetched IDs, then empty
-        mock_tracker.get_fetched_ids.side_effect = [["msg1"], []]
-
-        raw_text_path = tmp_path / "raw" / "msg1.txt"
-        raw_text_path.parent.mkdir(parents=True, exist_ok=True)
-        raw_text_path.write_text("Hello world", encoding="utf-8")
+        mock_tracker.get_fetched_ids.side_effect = (("msg1",), ())
 
+        # The converter is mocked, so the raw file never needs to exist on disk
         mock_tracker.get_message.return_value = {
             "message_id": "msg1",
             "subject": "Test Subject",
             "sender": "sender@example.com",
             "date": "2024-06-15T12:00:00",
-            "raw_text_path": str(raw_text_path),
+            "raw_text_path": "/fake/raw/msg1.txt",
             "raw_html_path": "",
             "status": "fetched",
         }
 
-        header = EmailHeader(
-            subject="Test Subject",
-            sender="sender@example.com",
-            to="",
-            date=datetime(2024, 6, 15, 12, 0, 0),
-        )
-        converted = ConvertedEmail(
-            message_id="msg1",
-            markdown="---\nsubject: Test\n---\nHello world",
-            header=header,
-        )
-        mock_converter.convert.return_value = converted
-        mock_writer.write.return_value = tmp_path / "output" / "2024-06-15_test_msg1.md"
-
-        ingestor = _build_ingestor(
-            tmp_settings,
-            mock_gmail_client,
-            mock_parser,
-            mock_converter,
-            mock_tracker,
-            mock_raw_store,
-            mock_writer,
-        )
+        mock_converter.convert.return_value = _CONVERTED
+        mock_converter.convert.side_effect = convert_side_effect
+        mock_writer.write.return_value = Path("/fake/output/2024-06-15_test_msg1.md")
 
         total = ingestor.run_convert_pending()
 
-        assert total == 1
+        assert total == expected_total
         mock_converter.convert.assert_called_once()
-        mock_writer.write.assert_called_once_with(converted)
-        # Should be marked as converted
-        converted_calls = [
-            c for c in mock_tracker.update_status.call_args_list if c[0][1] == "converted"
-        ]
-        assert len(converted_calls) == 1
-        assert ingestor._progress.messages_converted == 1
-
-    def test_conversion_failure_marks_message_as_failed(
+        assert mock_writer.write.call_args_list == [call(_CONVERTED)] * expected_total
+        # Exactly one status update, carrying the written path or the error
+        status_calls = _calls_with_status(mock_tracker.update_status, expected_status)
+        assert len(status_calls) == 1
+        assert expected_detail in str(status_calls[0])
+        assert ingestor._progress.messages_converted == expected_total
+        assert ingestor._progress.messages_failed == 1 - expected_total
+
+    def test_reads_raw_files_from_disk(
         self,
-        tmp_settings: GmailIngestorSettings,
-        mock_gmail_client: MagicMock,
-        mock_parser: MagicMock,
-        mock_converter: MagicMock,
-        mock_tracker: MagicMock,
-        mock_raw_store: MagicMock,
-        mock_writer: MagicMock,
         tmp_path: Path,
+        ingestor: EmailIngestor,
+        mock_converter: Mock,
+        mock_tracker: Mock,
+        mock_writer: Mock,
     ) -> None:
-        """run_convert_pending() marks messages as failed when conversion raises."""
-        mock_tracker.get_fetched_ids.side_effect = [["msg1"], []]
-
-        raw_text_path = tmp_path / "raw" / "msg1.txt"
-        raw_text_path.parent.mkdir(parents=True, exist_ok=True)
-        raw_text_path.write_text("Hello world", encoding="utf-8")
+        """run_convert_pending() hands the converter the stored raw text and HTML."""
+        text_path = tmp_path / "msg1.txt"
+        html_path = tmp_path / "msg1.html"
+        text_path.write_text("Plain body — ünïcode", encoding="utf-8")
+        html_path.write_text("<p>HTML body</p>", encoding="utf-8")
 
+        mock_tracker.get_fetched_ids.side_effect = (("msg1",), ())
         mock_tracker.get_message.return_value = {
             "message_id": "msg1",
             "subject": "Test Subject",
             "sender": "sender@example.com",
             "date": "2024-06-15T12:00:00",
-            "raw_text_path": str(raw_text_path),
-            "raw_html_path": "",
+            "raw_text_path": str(text_path),
+            "raw_html_path": str(html_path),
             "status": "fetched",
         }
+        mock_converter.convert.return_value = _CONVERTED
+        mock_writer.write.return_value = tmp_path / "2024-06-15_test_msg1.md"
 
-        mock_converter.convert.side_effect = ConversionError("No convertible content")
+        assert ingestor.run_convert_pending() == 1
 
-        ingestor = _build_ingestor(
-            tmp_settings,
-            mock_gmail_client,
-            mock_parser,
-            mock_converter,
-            mock_tracker,
-            mock_raw_store,
-            mock_writer,
-        )
-
-        total = ingestor.run_convert_pending()
-
-        assert total == 0
-        failed_calls = [c for c in mock_tracker.update_status.call_args_list if c[0][1] == "failed"]
-        assert len(failed_calls) == 1
-        assert "No convertible content" in str(failed_calls[0])
-        assert ingestor._progress.messages_failed == 1
+        message_id, _header, body = mock_converter.convert.call_args.args
+        assert message_id == "msg1"
+        assert body == EmailBody(plain_text="Plain body — ünïcode", html="<p>HTML body</p>")
 
 
 # ---------- Progress callback ----------
@@ -594,116 +611,55 @@ class TestProgressCallback:
 
     def test_progress_callback_is_called_during_discovery(
         self,
-        tmp_settings: GmailIngestorSettings,
-        mock_gmail_client: MagicMock,
-        mock_parser: MagicMock,
-        mock_converter: MagicMock,
-        mock_tracker: MagicMock,
-        mock_raw_store: MagicMock,
-        mock_writer: MagicMock,
+        make_ingestor: Callable[..., EmailIngestor],
+        mock_gmail_client: Mock,
+        mock_tracker: Mock,
     ) -> None:
         """on_progress callback is invoked during run_discovery() with updated counts."""
-        progress_updates: list[FetchProgress] = []
-
-        def capture_progress(progress: FetchProgress) -> None:
-            # Snapshot the current state (FetchProgress is mutable)
-            progress_updates.append(
-                FetchProgress(
-                    total_estimated=progress.total_estimated,
-                    ids_discovered=progress.ids_discovered,
-                    messages_fetched=progress.messages_fetched,
-                    messages_converted=progress.messages_converted,
-                    messages_failed=progress.messages_failed,
-                    current_stage=progress.current_stage,
-                )
-            )
+        progress_updates, capture_progress = _record_progress("ids_discovered")
 
         page1 = [MessageStub(message_id="msg1", thread_id="t1")]
         mock_gmail_client.discover_message_ids.return_value = iter([page1])
         mock_tracker.bulk_insert_pending.return_value = 1
 
-        ingestor = _build_ingestor(
-            tmp_settings,
-            mock_gmail_client,
-            mock_parser,
-            mock_converter,
-            mock_tracker,
-            mock_raw_store,
-            mock_writer,
-            on_progress=capture_progress,
-        )
+        ingestor = make_ingestor(on_progress=capture_progress)
 
         ingestor.run_discovery("INBOX")
 
         # At least one progress update should have been fired
         assert len(progress_updates) >= 1
         # The stage should be "discovery"
-        assert any(p.current_stage == "discovery" for p in progress_updates)
+        discovered = [ids for stage, ids in progress_updates if stage == "discovery"]
+        assert discovered
         # The last update should reflect 1 discovered ID
-        discovery_updates = [p for p in progress_updates if p.current_stage == "discovery"]
-        assert discovery_updates[-1].ids_discovered == 1
+        assert discovered[-1] == 1
 
     def test_progress_callback_is_called_during_fetch(
         self,
-        tmp_settings: GmailIngestorSettings,
-        mock_gmail_client: MagicMock,
-        mock_parser: MagicMock,
-        mock_converter: MagicMock,
-        mock_tracker: MagicMock,
-        mock_raw_store: MagicMock,
-        mock_writer: MagicMock,
+        make_ingestor: Callable[..., EmailIngestor],
+        mock_gmail_client: Mock,
+        mock_parser: Mock,
+        mock_tracker: Mock,
+        mock_raw_store: Mock,
     ) -> None:
         """on_progress callback is invoked during run_fetch_pending()."""
-        progress_updates: list[FetchProgress] = []
-
-        def capture_progress(progress: FetchProgress) -> None:
-            progress_updates.append(
-                FetchProgress(
-                    total_estimated=progress.total_estimated,
-                    ids_discovered=progress.ids_discovered,
-                    messages_fetched=progress.messages_fetched,
-                    messages_converted=progress.messages_converted,
-                    messages_failed=progress.messages_failed,
-                    current_stage=progress.current_stage,
-                )
-            )
+        progress_updates, capture_progress = _record_progress("messages_fetched")
 
-        mock_tracker.get_pending_ids.side_effect = [["msg1"], []]
+        mock_tracker.get_pending_ids.side_effect = (("msg1",), ())
         raw_msg = {"id": "msg1", "threadId": "t1", "payload": {}}
-        mock_gmail_client.fetch_messages_batch.return_value = [raw_msg]
+        mock_gmail_client.fetch_messages_batch.return_value = (raw_msg,)
 
-        header = EmailHeader(
-            subject="Test",
-            sender="s@example.com",
-            to="r@example.com",
-            date=datetime(2024, 1, 1),
-        )
-        body = EmailBody(plain_text="Hello")
-        email = EmailMessage(
-            message_id="msg1", thread_id="t1", header=header, body=body,
-        )
-        mock_parser.parse.return_value = email
+        mock_parser.parse.return_value = _EMAIL1
         mock_raw_store.store.return_value = {}
         mock_tracker.get_message.return_value = None
 
-        ingestor = _build_ingestor(
-            tmp_settings,
-            mock_gmail_client,
-            mock_parser,
-            mock_converter,
-            mock_tracker,
-            mock_raw_store,
-            mock_writer,
-            on_progress=capture_progress,
-        )
+        ingestor = make_ingestor(on_progress=capture_progress)
 
         ingestor.run_fetch_pending()
 
-        fetch_updates = [
-            p for p in progress_updates if p.current_stage == "fetch"
-        ]
-        assert len(fetch_updates) >= 1
-        assert any(p.messages_fetched >= 1 for p in fetch_updates)
+        fetched = [count for stage, count in progress_updates if stage == "fetch"]
+        assert len(fetched) >= 1
+        assert any(count >= 1 for count in fetched)
 
 
 # ---------- Discovery pagination ----------
@@ -712,98 +668,38 @@ class TestProgressCallback:
 class TestDiscoveryPagination:
     """Tests for pagination in run_discovery()."""
 
-    def test_discovery_with_limit(
-        self,
-        tmp_settings: GmailIngestorSettings,
-        mock_gmail_client: MagicMock,
-        mock_parser: MagicMock,
-        mock_converter: MagicMock,
-        mock_tracker: MagicMock,
-        mock_raw_store: MagicMock,
-        mock_writer: MagicMock,
-    ) -> None:
-        """run_discovery(limit=15) stops after collecting 15 stubs across pages."""
-        page1 = [MessageStub(message_id=f"m{i}", thread_id=f"t{i}") for i in range(10)]
-        page2 = [MessageStub(message_id=f"m{i}", thread_id=f"t{i}") for i in range(10, 20)]
-        page3 = [MessageStub(message_id=f"m{i}", thread_id=f"t{i}") for i in range(20, 30)]
-        mock_gmail_client.discover_message_ids.return_value = iter([page1, page2, page3])
-        mock_tracker.bulk_insert_pending.return_value = 0
-
-        ingestor = _build_ingestor(
-            tmp_settings, mock_gmail_client, mock_parser, mock_converter,
-            mock_tracker, mock_raw_store, mock_writer,
-        )
-
-        ingestor.run_discovery("INBOX", limit=15)
-
-        # Should have inserted 10 from page1 + 5 from page2
-        calls = mock_tracker.bulk_insert_pending.call_args_list
-        assert len(calls) == 2
-        assert len(calls[0][0][0]) == 10  # full page1
-        assert len(calls[1][0][0]) == 5   # first 5 of page2
-
-    def test_discovery_with_offset(
-        self,
-        tmp_settings: GmailIngestorSettings,
-        mock_gmail_client: MagicMock,
-        mock_parser: MagicMock,
-        mock_converter: MagicMock,
-        mock_tracker: MagicMock,
-        mock_raw_store: MagicMock,
-        mock_writer: MagicMock,
-    ) -> None:
-        """run_discovery(offset=3) skips first 3 stubs."""
-        page = [MessageStub(message_id=f"m{i}", thread_id=f"t{i}") for i in range(10)]
-        mock_gmail_client.discover_message_ids.return_value = iter([page])
-        mock_tracker.bulk_insert_pending.return_value = 7
-
-        ingestor = _build_ingestor(
-            tmp_settings, mock_gmail_client, mock_parser, mock_converter,
-            mock_tracker, mock_raw_store, mock_writer,
-        )
-
-        total = ingestor.run_discovery("INBOX", offset=3)
-
-        assert total == 7
-        calls = mock_tracker.bulk_insert_pending.call_args_list
-        assert len(calls) == 1
-        inserted_stubs = calls[0][0][0]
-        assert len(inserted_stubs) == 7
-        # Should start from m3 (skipping m0, m1, m2)
-        assert inserted_stubs[0] == ("m3", "t3")
-
-    def test_discovery_with_limit_and_offset(
+    @pytest.mark.parametrize(
+        ("page_count", "offset", "limit", "expected_batches"),
+        [
+            # 10 from page1 + first 5 of page2
+            pytest.param(3, 0, 15, [(0, 10), (10, 15)], id="limit"),
+            # Skips m0, m1, m2
+            pytest.param(1, 3, None, [(3, 10)], id="offset"),
+            # m5..m9 from page1 after the skip, then m10..m14 from page2
+            pytest.param(2, 5, 10, [(5, 10), (10, 15)], id="limit_and_offset"),
+        ],
+    )
+    def test_discovery_pagination(
         self,
-        tmp_settings: GmailIngestorSettings,
-        mock_gmail_client: MagicMock,
-        mock_parser: MagicMock,
-        mock_converter: MagicMock,
-        mock_tracker: MagicMock,
-        mock_raw_store: MagicMock,
-        mock_writer: MagicMock,
+        ingestor: EmailIngestor,
+        mock_gmail_client: Mock,
+        mock_tracker: Mock,
+        page_count: int,
+        offset: int,
+        limit: int | None,
+        expected_batches: list[tuple[int, int]],
     ) -> None:
-        """Offset=5 limit=10 with 20 available inserts exactly 10 after skip."""
-        page1 = [MessageStub(message_id=f"m{i}", thread_id=f"t{i}") for i in range(10)]
-        page2 = [MessageStub(message_id=f"m{i}", thread_id=f"t{i}") for i in range(10, 20)]
-        mock_gmail_client.discover_message_ids.return_value = iter([page1, page2])
-        mock_tracker.bulk_insert_pending.return_value = 0
-
-        ingestor = _build_ingestor(
-            tmp_settings, mock_gmail_client, mock_parser, mock_converter,
-            mock_tracker, mock_raw_store, mock_writer,
-        )
+        """run_discovery() skips `offset` stubs and stops after `limit`, across pages."""
+        pages = [_stubs(i * 10, (i + 1) * 10) for i in range(page_count)]
+        mock_gmail_client.discover_message_ids.return_value = iter(pages)
+        mock_tracker.bulk_insert_pending.side_effect = lambda rows, label: len(rows)
 
-        ingestor.run_discovery("INBOX", offset=5, limit=10)
+        total = ingestor.run_discovery("INBOX", offset=offset, limit=limit)
 
-        calls = mock_tracker.bulk_insert_pending.call_args_list
-        total_stubs = sum(len(c[0][0]) for c in calls)
-        assert total_stubs == 10
-        # First batch: m5..m9 (5 stubs from page1 after skipping 5)
-        assert len(calls[0][0][0]) == 5
-        assert calls[0][0][0][0] == ("m5", "t5")
-        # Second batch: m10..m14 (5 stubs from page2)
-        assert len(calls[1][0][0]) == 5
-        assert calls[1][0][0][0] == ("m10", "t10")
+        assert mock_tracker.bulk_insert_pending.call_args_list == [
+            call(_rows(start, stop), "INBOX") for start, stop in expected_batches
+        ]
+        assert total == sum(stop - start for start, stop in expected_batches)
 
 
 # ---------- Fetch pending pagination ----------
@@ -814,89 +710,52 @@ class TestFetchPendingPagination:
 
     def test_fetch_pending_with_limit(
         self,
-        tmp_settings: GmailIngestorSettings,
-        mock_gmail_client: MagicMock,
-        mock_parser: MagicMock,
-        mock_converter: MagicMock,
-        mock_tracker: MagicMock,
-        mock_raw_store: MagicMock,
-        mock_writer: MagicMock,
+        ingestor: EmailIngestor,
+        mock_gmail_client: Mock,
+        mock_parser: Mock,
+        mock_tracker: Mock,
+        mock_raw_store: Mock,
     ) -> None:
         """run_fetch_pending(limit=3) stops after fetching 3 messages."""
         # Return 3 IDs in first batch (which is the limit), then stop
-        mock_tracker.get_pending_ids.side_effect = [["m1", "m2", "m3"], []]
-
-        header = EmailHeader(
-            subject="Test", sender="s@test.com", to="r@test.com",
-            date=datetime(2024, 1, 1),
-        )
-        body = EmailBody(plain_text="Hello")
+        mock_tracker.get_pending_ids.side_effect = (("m1", "m2", "m3"), ())
 
-        def make_email(raw_msg: dict) -> EmailMessage:
-            msg_id = raw_msg["id"]
-            return EmailMessage(message_id=msg_id, thread_id="t1", header=header, body=body)
-
-        mock_parser.parse.side_effect = make_email
-        mock_gmail_client.fetch_messages_batch.return_value = [
+        mock_parser.parse.side_effect = _parse_stub
+        mock_gmail_client.fetch_messages_batch.return_value = (
             {"id": "m1"}, {"id": "m2"}, {"id": "m3"},
-        ]
+        )
         mock_raw_store.store.return_value = {}
         mock_tracker.get_message.return_value = None
 
-        ingestor = _build_ingestor(
-            tmp_settings, mock_gmail_client, mock_parser, mock_converter,
-            mock_tracker, mock_raw_store, mock_writer,
-        )
-
         total = ingestor.run_fetch_pending(limit=3)
         assert total == 3
 
-    def test_fetch_pending_with_offset(
+    @pytest.mark.parametrize(
+        ("kwargs", "expected_limit", "expected_offset"),
+        [
+            # None: falls back to the configured batch size
+            pytest.param({"offset": 5}, None, 5, id="offset"),
+            pytest.param({"batch_size": 10}, 10, 0, id="custom_batch_size"),
+        ],
+    )
+    def test_fetch_pending_query_window(
         self,
+        ingestor: EmailIngestor,
         tmp_settings: GmailIngestorSettings,
-        mock_gmail_client: MagicMock,
-        mock_parser: MagicMock,
-        mock_converter: MagicMock,
-        mock_tracker: MagicMock,
-        mock_raw_store: MagicMock,
-        mock_writer: MagicMock,
+        mock_tracker: Mock,
+        kwargs: dict[str, int],
+        expected_limit: int | None,
+        expected_offset: int,
     ) -> None:
-        """run_fetch_pending(offset=5) passes offset to get_pending_ids."""
-        mock_tracker.get_pending_ids.return_value = []
+        """run_fetch_pending() passes offset and batch_size through to get_pending_ids."""
+        mock_tracker.get_pending_ids.return_value = ()
 
-        ingestor = _build_ingestor(
-            tmp_settings, mock_gmail_client, mock_parser, mock_converter,
-            mock_tracker, mock_raw_store, mock_writer,
-        )
-
-        ingestor.run_fetch_pending(offset=5)
+        ingestor.run_fetch_pending(**kwargs)
 
         mock_tracker.get_pending_ids.assert_called_with(
-            limit=tmp_settings.batch_size, offset=5,
+            limit=expected_limit or tmp_settings.batch_size, offset=expected_offset,
         )
 
-    def test_fetch_pending_with_custom_batch_size(
-        self,
-        tmp_settings: GmailIngestorSettings,
-        mock_gmail_client: MagicMock,
-        mock_parser: MagicMock,
-        mock_converter: MagicMock,
-        mock_tracker: MagicMock,
-        mock_raw_store: MagicMock,
-        mock_writer: MagicMock,
-    ) -> None:
-        """run_fetch_pending(batch_size=10) uses overridden batch size."""
-        mock_tracker.get_pending_ids.return_value = []
-
-        ingestor = _build_ingestor(
-            tmp_settings, mock_gmail_client, mock_parser, mock_converter,
-            mock_tracker, mock_raw_store, mock_writer,
-        )
-
-        ingestor.run_fetch_pending(batch_size=10)
-
-        mock_tracker.get_pending_ids.assert_called_with(limit=10, offset=0)
-
 
 # ---------- Convert pending pagination ----------
 
@@ -906,47 +765,26 @@ class TestConvertPendingPagination:
 
     def test_convert_pending_with_limit(
         self,
-        tmp_settings: GmailIngestorSettings,
-        mock_gmail_client: MagicMock,
-        mock_parser: MagicMock,
-        mock_converter: MagicMock,
-        mock_tracker: MagicMock,
-        mock_raw_store: MagicMock,
-        mock_writer: MagicMock,
-        tmp_path: Path,
+        ingestor: EmailIngestor,
+        mock_converter: Mock,
+        mock_tracker: Mock,
+        mock_writer: Mock,
     ) -> None:
         """run_convert_pending(limit=1) converts only 1 message."""
-        mock_tracker.get_fetched_ids.side_effect = [["msg1"], []]
-
-        raw_text_path = tmp_path / "raw" / "msg1.txt"
-        raw_text_path.parent.mkdir(parents=True, exist_ok=True)
-        raw_text_path.write_text("Hello world", encoding="utf-8")
+        mock_tracker.get_fetched_ids.side_effect = (("msg1",), ())
 
         mock_tracker.get_message.return_value = {
             "message_id": "msg1",
             "subject": "Test",
             "sender": "s@test.com",
             "date": "2024-06-15T12:00:00",
-            "raw_text_path": str(raw_text_path),
+            "raw_text_path": "/fake/raw/msg1.txt",
             "raw_html_path": "",
             "status": "fetched",
         }
 
-        header = EmailHeader(
-            subject="Test", sender="s@test.com", to="", date=datetime(2024, 6, 15, 12, 0, 0),
-        )
-        converted = ConvertedEmail(
-            message_id="msg1",
-            markdown="---\nsubject: Test\n---\nHello",
-            header=header,
-        )
-        mock_converter.convert.return_value = converted
-        mock_writer.write.return_value = tmp_path / "output" / "test.md"
-
-        ingestor = _build_ingestor(
-            tmp_settings, mock_gmail_client, mock_parser, mock_converter,
-            mock_tracker, mock_raw_store, mock_writer,
-        )
+        mock_converter.convert.return_value = _CONVERTED
+        mock_writer.write.return_value = Path("/fake/output/test.md")
 
         total = ingestor.run_convert_pending(limit=1)
         assert total == 1
@@ -960,25 +798,15 @@ class TestRunPipelinePagination:
 
     def test_run_full_pipeline_limit_caps_discovery(
         self,
-        tmp_settings: GmailIngestorSettings,
-        mock_gmail_client: MagicMock,
-        mock_parser: MagicMock,
-        mock_converter: MagicMock,
-        mock_tracker: MagicMock,
-        mock_raw_store: MagicMock,
-        mock_writer: MagicMock,
+        ingestor: EmailIngestor,
+        mock_gmail_client: Mock,
+        mock_tracker: Mock,
     ) -> None:
         """run(limit=10) passes limit to discovery, batch_size to fetch/convert."""
-        page = [MessageStub(message_id=f"m{i}", thread_id=f"t{i}") for i in range(10)]
-        mock_gmail_client.discover_message_ids.return_value = iter([page])
+        mock_gmail_client.discover_message_ids.return_value = iter([_stubs(0, 10)])
         mock_tracker.bulk_insert_pending.return_value = 10
-        mock_tracker.get_pending_ids.return_value = []
-        mock_tracker.get_fetched_ids.return_value = []
-
-        ingestor = _build_ingestor(
-            tmp_settings, mock_gmail_client, mock_parser, mock_converter,
-            mock_tracker, mock_raw_store, mock_writer,
-        )
+        mock_tracker.get_pending_ids.return_value = ()
+        mock_tracker.get_fetched_ids.return_value = ()
 
         ingestor.run(label_id="INBOX", limit=10, batch_size=25)
 
@@ -1000,51 +828,30 @@ class TestInterBatchDelay:
 
     def test_inter_batch_delay_is_applied(
         self,
-        mock_gmail_client: MagicMock,
-        mock_parser: MagicMock,
-        mock_converter: MagicMock,
-        mock_tracker: MagicMock,
-        mock_raw_store: MagicMock,
-        mock_writer: MagicMock,
-        tmp_path: Path,
+        make_ingestor: Callable[..., EmailIngestor],
+        tmp_settings: GmailIngestorSettings,
+        mock_gmail_client: Mock,
+        mock_parser: Mock,
+        mock_tracker: Mock,
+        mock_raw_store: Mock,
     ) -> None:
         """run_fetch_pending() sleeps inter_batch_delay_seconds between batches."""
-        settings = GmailIngestorSettings(
-            credentials_path=tmp_path / "creds" / "client_secret.json",
-            token_path=tmp_path / "creds" / "token.json",
-            database_path=tmp_path / "data" / "test.db",
-            output_markdown_dir=tmp_path / "output" / "markdown",
-            output_raw_dir=tmp_path / "output" / "raw",
-            inter_batch_delay_seconds=2.0,
-            batch_size=2,
+        settings = tmp_settings.model_copy(
+            update={"inter_batch_delay_seconds": 2.0, "batch_size": 2},
         )
 
         # Two batches of pending IDs, then empty
-        mock_tracker.get_pending_ids.side_effect = [["m1", "m2"], ["m3"], []]
+        mock_tracker.get_pending_ids.side_effect = (("m1", "m2"), ("m3",), ())
 
-        header = EmailHeader(
-            subject="Test", sender="s@test.com", to="r@test.com",
-            date=datetime(2024, 1, 1),
+        mock_parser.parse.side_effect = _parse_stub
+        mock_gmail_client.fetch_messages_batch.side_effect = (
+            ({"id": "m1"}, {"id": "m2"}),
+            ({"id": "m3"},),
         )
-        body = EmailBody(plain_text="Hello")
-
-        def make_email(raw_msg: dict) -> EmailMessage:
-            return EmailMessage(
-                message_id=raw_msg["id"], thread_id="t1", header=header, body=body,
-            )
-
-        mock_parser.parse.side_effect = make_email
-        mock_gmail_client.fetch_messages_batch.side_effect = [
-            [{"id": "m1"}, {"id": "m2"}],
-            [{"id": "m3"}],
-        ]
         mock_raw_store.store.return_value = {}
         mock_tracker.get_message.return_value = None
 
-        ingestor = _build_ingestor(
-            settings, mock_gmail_client, mock_parser, mock_converter,
-            mock_tracker, mock_raw_store, mock_writer,
-        )
+        ingestor = make_ingestor(settings)
 
         with patch("gmail_ingestor.pipeline.ingestor.time.sleep") as mock_sleep:
             total = ingestor.run_fetch_pending()
@@ -1056,30 +863,16 @@ class TestInterBatchDelay:
 
     def test_no_delay_when_inter_batch_delay_is_zero(
         self,
-        mock_gmail_client: MagicMock,
-        mock_parser: MagicMock,
-        mock_converter: MagicMock,
-        mock_tracker: MagicMock,
-        mock_raw_store: MagicMock,
-        mock_writer: MagicMock,
-        tmp_path: Path,
+        make_ingestor: Callable[..., EmailIngestor],
+        tmp_settings: GmailIngestorSettings,
+        mock_tracker: Mock,
     ) -> None:
         """No sleep when inter_batch_delay_seconds is 0."""
-        settings = GmailIngestorSettings(
-            credentials_path=tmp_path / "creds" / "client_secret.json",
-            token_path=tmp_path / "creds" / "token.json",
-            database_path=tmp_path / "data" / "test.db",
-            output_markdown_dir=tmp_path / "output" / "markdown",
-            output_raw_dir=tmp_path / "output" / "raw",
-            inter_batch_delay_seconds=0.0,
-        )
+        settings = tmp_settings.model_copy(update={"inter_batch_delay_seconds": 0.0})
 
-        mock_tracker.get_pending_ids.return_value = []
+        mock_tracker.get_pending_ids.return_value = ()
 
-        ingestor = _build_ingestor(
-            settings, mock_gmail_client, mock_parser, mock_converter,
-            mock_tracker, mock_raw_store, mock_writer,
-        )
+        ingestor = make_ingestor(settings)
 
         with patch("gmail_ingestor.pipeline.ingestor.time.sleep") as mock_sleep:
             ingestor.run_fetch_pending()
@@ -1095,52 +888,34 @@ class TestRateLimitErrorPropagation:
 
     def test_rate_limit_error_propagates_from_fetch(
         self,
-        tmp_settings: GmailIngestorSettings,
-        mock_gmail_client: MagicMock,
-        mock_parser: MagicMock,
-        mock_converter: MagicMock,
-        mock_tracker: MagicMock,
-        mock_raw_store: MagicMock,
-        mock_writer: MagicMock,
+        ingestor: EmailIngestor,
+        mock_gmail_client: Mock,
+        mock_tracker: Mock,
     ) -> None:
         """RateLimitError from fetch_messages_batch() propagates to caller."""
-        mock_tracker.get_pending_ids.return_value = ["m1"]
+        mock_tracker.get_pending_ids.return_value = ("m1",)
         mock_gmail_client.fetch_messages_batch.side_effect = RateLimitError(
             "Rate limited after retries"
         )
 
-        ingestor = _build_ingestor(
-            tmp_settings, mock_gmail_client, mock_parser, mock_converter,
-            mock_tracker, mock_raw_store, mock_writer,
-        )
-
         with patch("gmail_ingestor.pipeline.ingestor.time.sleep"):
             with pytest.raises(RateLimitError, match="Rate limited after retries"):
                 ingestor.run_fetch_pending()
 
     def test_non_rate_limit_error_breaks_loop_without_raising(
         self,
-        tmp_settings: GmailIngestorSettings,
-        mock_gmail_client: MagicMock,
-        mock_parser: MagicMock,
-        mock_converter: MagicMock,
-        mock_tracker: MagicMock,
-        mock_raw_store: MagicMock,
-        mock_writer: MagicMock,
+        ingestor: EmailIngestor,
+        mock_gmail_client: Mock,
+        mock_tracker: Mock,
     ) -> None:
         """Non-rate-limit GmailIngestorError breaks the loop gracefully."""
         from gmail_ingestor.core.exceptions import GmailIngestorError
 
-        mock_tracker.get_pending_ids.return_value = ["m1"]
+        mock_tracker.get_pending_ids.return_value = ("m1",)
         mock_gmail_client.fetch_messages_batch.side_effect = GmailIngestorError(
             "Network timeout"
         )
 
-        ingestor = _build_ingestor(
-            tmp_settings, mock_gmail_client, mock_parser, mock_converter,
-            mock_tracker, mock_raw_store, mock_writer,
-        )
-
         with patch("gmail_ingestor.pipeline.ingestor.time.sleep"):
             # Should NOT raise — it breaks the loop
             total = ingestor.run_fetch_pending()
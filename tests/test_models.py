@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
-from dataclasses import FrozenInstanceError
+import inspect
+from dataclasses import FrozenInstanceError, asdict, fields, replace
 from datetime import datetime
+from operator import attrgetter
+from typing import Any
 
 import pytest
 
@@ -16,6 +19,31 @@ from gmail_ingestor.core.models import (
     MessageStub,
 )
 
+# Pure in-memory tests: keep them on one xdist worker under --dist=loadgroup
+pytestmark = pytest.mark.xdist_group("models_pure")
+
+# Frozen samples shared by tests that only read fields; tests that need
+# variants patch them with dataclasses.replace instead of spelling out every field
+_DT = datetime(2025, 6, 15, 9, 30, 0)
+_STUB = MessageStub(message_id="m", thread_id="t")
+_HEADER = EmailHeader(subject="Hi", sender="a@b.com", to="c@d.com", date=_DT)
+_MSG_TEMPLATE = EmailMessage(message_id="m1", thread_id="t1")
+_CONV_TEMPLATE = ConvertedEmail(message_id="m1", markdown="", header=_HEADER)
+
+_GET_HEADER_FIELDS = attrgetter(*EmailHeader._FIELD_NAMES)
+
+# The interned empty tuple; bound to a name since `x is ()` is a SyntaxWarning
+_EMPTY: tuple[str, ...] = ()
+
+_PROGRESS_DEFAULTS: dict[str, Any] = {
+    "total_estimated": 0,
+    "ids_discovered": 0,
+    "messages_fetched": 0,
+    "messages_converted": 0,
+    "messages_failed": 0,
+    "current_stage": "idle",
+}
+
 # ---------------------------------------------------------------------------
 # MessageStub
 # ---------------------------------------------------------------------------
@@ -25,25 +53,27 @@ class TestMessageStub:
     """MessageStub is a frozen dataclass with message_id and thread_id."""
 
     def test_stores_fields(self) -> None:
-        stub = MessageStub(message_id="msg_1", thread_id="thread_1")
-        assert stub.message_id == "msg_1"
-        assert stub.thread_id == "thread_1"
-
-    def test_frozen(self) -> None:
-        stub = MessageStub(message_id="msg_1", thread_id="thread_1")
-        with pytest.raises(FrozenInstanceError):
-            stub.message_id = "msg_2"  # type: ignore[misc]
+        assert _STUB.message_id == "m"
+        assert _STUB.thread_id == "t"
 
     def test_equality(self) -> None:
-        a = MessageStub(message_id="m", thread_id="t")
-        b = MessageStub(message_id="m", thread_id="t")
-        assert a == b
+        # A distinct instance, so this exercises __eq__ rather than identity
+        assert MessageStub(message_id="m", thread_id="t") == _STUB
 
     def test_inequality(self) -> None:
         a = MessageStub(message_id="m1", thread_id="t")
         b = MessageStub(message_id="m2", thread_id="t")
         assert a != b
 
+    def test_hashable_for_dedup(self) -> None:
+        """frozen + eq generates __hash__, so stubs dedupe in a set by value."""
+        stubs = [MessageStub(message_id=f"m{i}", thread_id="t") for i in range(10_000)]
+        seen = set(stubs)
+        seen.update(MessageStub(message_id=f"m{i}", thread_id="t") for i in range(10_000))
+        assert len(seen) == 10_000
+        assert MessageStub(message_id="m9999", thread_id="t") in seen
+        assert hash(MessageStub(message_id="m", thread_id="t")) == hash(_STUB)
+
 
 # ---------------------------------------------------------------------------
 # EmailHeader
@@ -53,45 +83,39 @@ class TestMessageStub:
 class TestEmailHeader:
     """EmailHeader stores all header fields with defaults for cc and message_id_header."""
 
-    @pytest.fixture()
-    def header_date(self) -> datetime:
-        return datetime(2025, 6, 15, 9, 30, 0)
-
-    def test_stores_all_fields(self, header_date: datetime) -> None:
+    def test_stores_all_fields(self) -> None:
         header = EmailHeader(
             subject="Hello",
             sender="alice@example.com",
             to="bob@example.com",
-            date=header_date,
+            date=_DT,
             cc="carol@example.com",
             message_id_header="<abc@example.com>",
         )
-        assert header.subject == "Hello"
-        assert header.sender == "alice@example.com"
-        assert header.to == "bob@example.com"
-        assert header.date == header_date
-        assert header.cc == "carol@example.com"
-        assert header.message_id_header == "<abc@example.com>"
-
-    def test_defaults(self, header_date: datetime) -> None:
-        header = EmailHeader(
-            subject="Hi",
-            sender="a@b.com",
-            to="c@d.com",
-            date=header_date,
+        assert _GET_HEADER_FIELDS(header) == (
+            "Hello",
+            "alice@example.com",
+            "bob@example.com",
+            _DT,
+            "carol@example.com",
+            "<abc@example.com>",
+            (),
+            (),
         )
-        assert header.cc == ""
-        assert header.message_id_header == ""
 
-    def test_frozen(self, header_date: datetime) -> None:
+    def test_field_names_cached(self) -> None:
+        """_FIELD_NAMES mirrors dataclasses.fields() in declaration order."""
+        assert EmailHeader._FIELD_NAMES == tuple(f.name for f in fields(EmailHeader))
+
+    def test_defaults(self) -> None:
         header = EmailHeader(
             subject="Hi",
             sender="a@b.com",
             to="c@d.com",
-            date=header_date,
+            date=_DT,
         )
-        with pytest.raises(FrozenInstanceError):
-            header.subject = "Changed"  # type: ignore[misc]
+        assert header.cc == ""
+        assert header.message_id_header == ""
 
 
 # ---------------------------------------------------------------------------
@@ -99,33 +123,23 @@ class TestEmailHeader:
 # ---------------------------------------------------------------------------
 
 
-class TestEmailBody:
-    """EmailBody stores optional plain_text and html, both defaulting to None."""
-
-    def test_defaults_to_none(self) -> None:
-        body = EmailBody()
-        assert body.plain_text is None
-        assert body.html is None
-
-    def test_plain_text_only(self) -> None:
-        body = EmailBody(plain_text="Hello")
-        assert body.plain_text == "Hello"
-        assert body.html is None
-
-    def test_html_only(self) -> None:
-        body = EmailBody(html="<p>Hello</p>")
-        assert body.plain_text is None
-        assert body.html == "<p>Hello</p>"
-
-    def test_both_parts(self) -> None:
-        body = EmailBody(plain_text="Hello", html="<p>Hello</p>")
-        assert body.plain_text == "Hello"
-        assert body.html == "<p>Hello</p>"
-
-    def test_frozen(self) -> None:
-        body = EmailBody(plain_text="Hello")
-        with pytest.raises(FrozenInstanceError):
-            body.plain_text = "Changed"  # type: ignore[misc]
+# EmailBody stores optional plain_text and html, both defaulting to None.
+@pytest.mark.parametrize(
+    ("kwargs", "expected"),
+    [
+        pytest.param({}, (None, None), id="defaults_to_none"),
+        pytest.param({"plain_text": "Hello"}, ("Hello", None), id="plain_text_only"),
+        pytest.param({"html": "<p>Hello</p>"}, (None, "<p>Hello</p>"), id="html_only"),
+        pytest.param(
+            {"plain_text": "Hello", "html": "<p>Hello</p>"},
+            ("Hello", "<p>Hello</p>"),
+            id="both_parts",
+        ),
+    ],
+)
+def test_email_body_fields(kwargs: dict[str, str], expected: tuple[str | None, str | None]) -> None:
+    body = EmailBody(**kwargs)
+    assert (body.plain_text, body.html) == expected
 
 
 # ---------------------------------------------------------------------------
@@ -137,7 +151,7 @@ class TestEmailMessage:
     """EmailMessage stores all fields with proper defaults."""
 
     def test_required_fields_only(self) -> None:
-        msg = EmailMessage(message_id="m1", thread_id="t1")
+        msg = _MSG_TEMPLATE
         assert msg.message_id == "m1"
         assert msg.thread_id == "t1"
         assert msg.label_ids == ()
@@ -146,42 +160,29 @@ class TestEmailMessage:
         assert msg.snippet == ""
 
     def test_all_fields(self) -> None:
-        dt = datetime(2025, 1, 1, 12, 0, 0)
         header = EmailHeader(
             subject="Subj",
             sender="s@e.com",
             to="t@e.com",
-            date=dt,
+            date=_DT,
         )
         body = EmailBody(plain_text="text")
-        msg = EmailMessage(
-            message_id="m1",
-            thread_id="t1",
+        msg = replace(
+            _MSG_TEMPLATE,
             label_ids=("INBOX", "UNREAD"),
             header=header,
             body=body,
             snippet="text",
         )
         assert msg.label_ids == ("INBOX", "UNREAD")
-        assert msg.header is header
-        assert msg.body is body
+        assert msg.header is header and msg.body is body
         assert msg.snippet == "text"
 
     def test_label_ids_default_is_empty_tuple(self) -> None:
-        msg = EmailMessage(message_id="m1", thread_id="t1")
-        assert msg.label_ids == ()
-        assert isinstance(msg.label_ids, tuple)
-
-    def test_frozen(self) -> None:
-        msg = EmailMessage(message_id="m1", thread_id="t1")
-        with pytest.raises(FrozenInstanceError):
-            msg.message_id = "m2"  # type: ignore[misc]
-
-    def test_label_ids_default_not_shared(self) -> None:
-        """Each instance gets its own default tuple (immutable anyway, but verify)."""
-        a = EmailMessage(message_id="a", thread_id="t")
-        b = EmailMessage(message_id="b", thread_id="t")
-        assert a.label_ids == b.label_ids
+        """Every instance shares the interned empty tuple -- no per-instance allocation."""
+        other = EmailMessage(message_id="b", thread_id="t")
+        assert _MSG_TEMPLATE.label_ids is _EMPTY
+        assert other.label_ids is _EMPTY
 
 
 # ---------------------------------------------------------------------------
@@ -192,38 +193,53 @@ class TestEmailMessage:
 class TestConvertedEmail:
     """ConvertedEmail is frozen and stores message_id, markdown, and header."""
 
-    @pytest.fixture()
+    @pytest.fixture(scope="module")
     def header(self) -> EmailHeader:
-        return EmailHeader(
-            subject="Test",
-            sender="a@b.com",
-            to="c@d.com",
-            date=datetime(2025, 3, 1, 8, 0, 0),
-        )
+        return EmailHeader(subject="Test", sender="a@b.com", to="c@d.com", date=_DT)
 
     def test_stores_fields(self, header: EmailHeader) -> None:
-        converted = ConvertedEmail(
-            message_id="m1",
-            markdown="# Hello",
-            header=header,
-        )
+        converted = replace(_CONV_TEMPLATE, markdown="# Hello", header=header)
         assert converted.message_id == "m1"
         assert converted.markdown == "# Hello"
         assert converted.header is header
 
-    def test_frozen(self, header: EmailHeader) -> None:
-        converted = ConvertedEmail(
-            message_id="m1",
-            markdown="# Hello",
-            header=header,
-        )
+    def test_no_defaults(self) -> None:
+        """All three fields are required -- none has a default in __init__."""
+        params = inspect.signature(ConvertedEmail).parameters
+        assert list(params) == ["message_id", "markdown", "header"]
+        assert all(p.default is inspect.Parameter.empty for p in params.values())
+
+
+# ---------------------------------------------------------------------------
+# Immutability
+# ---------------------------------------------------------------------------
+
+_FROZEN_CASES: dict[str, tuple[object, str, str]] = {
+    "stub": (MessageStub("msg_1", "thread_1"), "message_id", "msg_2"),
+    "header": (_HEADER, "subject", "Changed"),
+    "body": (EmailBody(plain_text="Hello"), "plain_text", "Changed"),
+    "message": (EmailMessage("m1", "t1"), "message_id", "m2"),
+    "converted": (ConvertedEmail("m1", "# Hello", _HEADER), "markdown", "# Changed"),
+}
+
+
+class TestFrozen:
+    """Every model except FetchProgress is frozen and slotted."""
+
+    @pytest.mark.parametrize(
+        ("instance", "attr", "value"),
+        [pytest.param(*case, id=case_id) for case_id, case in _FROZEN_CASES.items()],
+    )
+    def test_frozen(self, instance: object, attr: str, value: str) -> None:
         with pytest.raises(FrozenInstanceError):
-            converted.markdown = "# Changed"  # type: ignore[misc]
+            setattr(instance, attr, value)
 
-    def test_no_defaults(self) -> None:
-        """All three fields are required -- missing any raises TypeError."""
-        with pytest.raises(TypeError):
-            ConvertedEmail(message_id="m1", markdown="md")  # type: ignore[call-arg]
+    @pytest.mark.parametrize(
+        "instance", [pytest.param(case[0], id=case_id) for case_id, case in _FROZEN_CASES.items()]
+    )
+    def test_slots(self, instance: object) -> None:
+        """slots=True drops the per-instance __dict__ (smaller, faster attribute access)."""
+        assert not hasattr(instance, "__dict__")
 
 
 # ---------------------------------------------------------------------------
@@ -231,44 +247,70 @@ class TestConvertedEmail:
 # ---------------------------------------------------------------------------
 
 
-class TestFetchProgress:
-    """FetchProgress is mutable and has sensible defaults."""
+# FetchProgress is mutable and has sensible defaults.
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        pytest.param({}, id="defaults"),
+        pytest.param(
+            {"total_estimated": 200, "current_stage": "converting"}, id="partial_override"
+        ),
+    ],
+)
+def test_fetch_progress_construction(kwargs: dict[str, Any]) -> None:
+    progress = FetchProgress(**kwargs)
+    # Fields not passed remain at their defaults
+    assert asdict(progress) == {**_PROGRESS_DEFAULTS, **kwargs}
 
-    def test_defaults(self) -> None:
-        progress = FetchProgress()
-        assert progress.total_estimated == 0
-        assert progress.ids_discovered == 0
-        assert progress.messages_fetched == 0
-        assert progress.messages_converted == 0
-        assert progress.messages_failed == 0
-        assert progress.current_stage == "idle"
-
-    def test_mutable(self) -> None:
-        progress = FetchProgress()
-        progress.total_estimated = 100
-        progress.ids_discovered = 50
-        progress.messages_fetched = 25
-        progress.messages_converted = 20
-        progress.messages_failed = 2
-        progress.current_stage = "fetching"
-
-        assert progress.total_estimated == 100
-        assert progress.ids_discovered == 50
-        assert progress.messages_fetched == 25
-        assert progress.messages_converted == 20
-        assert progress.messages_failed == 2
-        assert progress.current_stage == "fetching"
-
-    def test_partial_override(self) -> None:
-        progress = FetchProgress(total_estimated=200, current_stage="converting")
-        assert progress.total_estimated == 200
-        assert progress.current_stage == "converting"
-        # Other fields remain at defaults
-        assert progress.ids_discovered == 0
-        assert progress.messages_fetched == 0
-
-    def test_is_not_frozen(self) -> None:
-        """FetchProgress should NOT raise FrozenInstanceError on assignment."""
-        progress = FetchProgress()
-        progress.current_stage = "done"
-        assert progress.current_stage == "done"
+
+def test_fetch_progress_mutable() -> None:
+    progress = FetchProgress()
+    updates: dict[str, Any] = {
+        "total_estimated": 100,
+        "ids_discovered": 50,
+        "messages_fetched": 25,
+        "messages_converted": 20,
+        "messages_failed": 2,
+        "current_stage": "fetching",
+    }
+    for name, value in updates.items():
+        setattr(progress, name, value)
+
+    assert asdict(progress) == {**_PROGRESS_DEFAULTS, **updates}
+
+
+def test_fetch_progress_is_slotted() -> None:
+    """Mutable but slotted: assigning a misspelled field fails instead of adding one."""
+    progress = FetchProgress()
+    assert not hasattr(progress, "__dict__")
+    with pytest.raises(AttributeError):
+        progress.messages_fetchd = 1  # type: ignore[attr-defined]
+
+
+def test_fetch_progress_is_not_frozen() -> None:
+    """FetchProgress should NOT raise FrozenInstanceError on assignment."""
+    progress = FetchProgress()
+    progress.current_stage = "done"
+    assert progress.current_stage == "done"
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+_BODY = EmailBody(plain_text="text")
+
+
+@pytest.mark.benchmark(group="models")
+def test_bench_email_message(benchmark: Any) -> None:
+    """Baseline for constructing one fully populated EmailMessage (one per fetched mail)."""
+    msg = benchmark(
+        EmailMessage,
+        "m",
+        "t",
+        label_ids=("A", "B"),
+        header=_HEADER,
+        body=_BODY,
+        snippet="s",
+    )
+    assert msg.header is _HEADER
@@ -3,21 +3,33 @@
 from __future__ import annotations
 
 import base64
+from dataclasses import asdict
 from datetime import UTC, datetime, timedelta, timezone
 from typing import Any
+from unittest.mock import patch
 
 import pytest
 
+from gmail_ingestor.core import parser as parser_module
 from gmail_ingestor.core.exceptions import ParseError
 from gmail_ingestor.core.parser import GmailParser
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def parser() -> GmailParser:
-    """Fresh GmailParser instance."""
+    """Shared GmailParser instance (it keeps no state between parse() calls)."""
     return GmailParser()
 
 
+def _expected(*, header: dict[str, Any], body: dict[str, str], **fields: Any) -> dict[str, Any]:
+    """asdict() of a parsed EmailMessage; omitted optional headers and bodies are defaults."""
+    return {
+        **fields,
+        "header": {"cc": "", "message_id_header": "", "label_ids": (), "label_names": (), **header},
+        "body": {"plain_text": None, "html": None, **body},
+    }
+
+
 # ---------------------------------------------------------------------------
 # 1. Simple text email
 # ---------------------------------------------------------------------------
@@ -26,54 +38,22 @@ def parser() -> GmailParser:
 class TestSimpleTextEmail:
     """Parsing a plain text/plain message with all standard headers."""
 
-    def test_message_id(self, parser: GmailParser, simple_text_raw: dict[str, Any]) -> None:
-        msg = parser.parse(simple_text_raw)
-        assert msg.message_id == "msg_simple_text"
-
-    def test_thread_id(self, parser: GmailParser, simple_text_raw: dict[str, Any]) -> None:
-        msg = parser.parse(simple_text_raw)
-        assert msg.thread_id == "thread_001"
-
-    def test_label_ids(self, parser: GmailParser, simple_text_raw: dict[str, Any]) -> None:
-        msg = parser.parse(simple_text_raw)
-        assert msg.label_ids == ("INBOX", "UNREAD")
-
-    def test_snippet(self, parser: GmailParser, simple_text_raw: dict[str, Any]) -> None:
-        msg = parser.parse(simple_text_raw)
-        assert msg.snippet == "Hello, this is a plain text email."
-
-    def test_subject(self, parser: GmailParser, simple_text_raw: dict[str, Any]) -> None:
-        msg = parser.parse(simple_text_raw)
-        assert msg.header.subject == "Plain Text Email"
-
-    def test_sender(self, parser: GmailParser, simple_text_raw: dict[str, Any]) -> None:
-        msg = parser.parse(simple_text_raw)
-        assert msg.header.sender == "sender@example.com"
-
-    def test_to(self, parser: GmailParser, simple_text_raw: dict[str, Any]) -> None:
-        msg = parser.parse(simple_text_raw)
-        assert msg.header.to == "recipient@example.com"
-
-    def test_cc(self, parser: GmailParser, simple_text_raw: dict[str, Any]) -> None:
-        msg = parser.parse(simple_text_raw)
-        assert msg.header.cc == "cc@example.com"
-
-    def test_message_id_header(self, parser: GmailParser, simple_text_raw: dict[str, Any]) -> None:
-        msg = parser.parse(simple_text_raw)
-        assert msg.header.message_id_header == "<msg001@example.com>"
-
-    def test_date_parsed(self, parser: GmailParser, simple_text_raw: dict[str, Any]) -> None:
-        msg = parser.parse(simple_text_raw)
-        expected = datetime(2024, 1, 15, 10, 30, 0, tzinfo=timezone(timedelta(hours=-5)))
-        assert msg.header.date == expected
-
-    def test_body_plain_text(self, parser: GmailParser, simple_text_raw: dict[str, Any]) -> None:
-        msg = parser.parse(simple_text_raw)
-        assert msg.body.plain_text == "Hello, this is a plain text email.\n\nBest regards,\nSender"
-
-    def test_body_html_is_none(self, parser: GmailParser, simple_text_raw: dict[str, Any]) -> None:
-        msg = parser.parse(simple_text_raw)
-        assert msg.body.html is None
+    def test_full_parse(self, parser: GmailParser, simple_text_raw: dict[str, Any]) -> None:
+        assert asdict(parser.parse(simple_text_raw)) == _expected(
+            message_id="msg_simple_text",
+            thread_id="thread_001",
+            label_ids=("INBOX", "UNREAD"),
+            snippet="Hello, this is a plain text email.",
+            header={
+                "subject": "Plain Text Email",
+                "sender": "sender@example.com",
+                "to": "recipient@example.com",
+                "date": datetime(2024, 1, 15, 10, 30, 0, tzinfo=timezone(timedelta(hours=-5))),
+                "cc": "cc@example.com",
+                "message_id_header": "<msg001@example.com>",
+            },
+            body={"plain_text": "Hello, this is a plain text email.\n\nBest regards,\nSender"},
+        )
 
 
 # ---------------------------------------------------------------------------
@@ -82,59 +62,28 @@ class TestSimpleTextEmail:
 
 
 class TestSimpleHtmlEmail:
-    """Parsing a text/html message."""
-
-    def test_message_id(self, parser: GmailParser, simple_html_raw: dict[str, Any]) -> None:
-        msg = parser.parse(simple_html_raw)
-        assert msg.message_id == "msg_simple_html"
-
-    def test_thread_id(self, parser: GmailParser, simple_html_raw: dict[str, Any]) -> None:
-        msg = parser.parse(simple_html_raw)
-        assert msg.thread_id == "thread_002"
-
-    def test_label_ids(self, parser: GmailParser, simple_html_raw: dict[str, Any]) -> None:
-        msg = parser.parse(simple_html_raw)
-        assert msg.label_ids == ("INBOX",)
-
-    def test_subject(self, parser: GmailParser, simple_html_raw: dict[str, Any]) -> None:
-        msg = parser.parse(simple_html_raw)
-        assert msg.header.subject == "HTML Email"
-
-    def test_sender(self, parser: GmailParser, simple_html_raw: dict[str, Any]) -> None:
-        msg = parser.parse(simple_html_raw)
-        assert msg.header.sender == "newsletter@example.com"
-
-    def test_date_utc(self, parser: GmailParser, simple_html_raw: dict[str, Any]) -> None:
-        msg = parser.parse(simple_html_raw)
-        expected = datetime(2024, 1, 16, 14, 0, 0, tzinfo=UTC)
-        assert msg.header.date == expected
-
-    def test_cc_defaults_empty(self, parser: GmailParser, simple_html_raw: dict[str, Any]) -> None:
-        """HTML fixture has no Cc header; should default to empty string."""
-        msg = parser.parse(simple_html_raw)
-        assert msg.header.cc == ""
-
-    def test_message_id_header_defaults_empty(
-        self, parser: GmailParser, simple_html_raw: dict[str, Any]
-    ) -> None:
-        """HTML fixture has no Message-ID header; should default to empty string."""
-        msg = parser.parse(simple_html_raw)
-        assert msg.header.message_id_header == ""
-
-    def test_body_html_content(self, parser: GmailParser, simple_html_raw: dict[str, Any]) -> None:
-        msg = parser.parse(simple_html_raw)
-        expected_html = (
-            "<!DOCTYPE html><html><body><h1>Hello World</h1>"
-            "<p>This is an <strong>HTML</strong> email with "
-            '<a href="https://example.com">a link</a>.</p></body></html>'
+    """Parsing a text/html message; it has no Cc or Message-ID header."""
+
+    def test_full_parse(self, parser: GmailParser, simple_html_raw: dict[str, Any]) -> None:
+        assert asdict(parser.parse(simple_html_raw)) == _expected(
+            message_id="msg_simple_html",
+            thread_id="thread_002",
+            label_ids=("INBOX",),
+            snippet="Hello, this is an HTML email.",
+            header={
+                "subject": "HTML Email",
+                "sender": "newsletter@example.com",
+                "to": "recipient@example.com",
+                "date": datetime(2024, 1, 16, 14, 0, 0, tzinfo=UTC),
+            },
+            body={
+                "html": (
+                    "<!DOCTYPE html><html><body><h1>Hello World</h1>"
+                    "<p>This is an <strong>HTML</strong> email with "
+                    '<a href="https://example.com">a link</a>.</p></body></html>'
+                )
+            },
         )
-        assert msg.body.html == expected_html
-
-    def test_body_plain_text_is_none(
-        self, parser: GmailParser, simple_html_raw: dict[str, Any]
-    ) -> None:
-        msg = parser.parse(simple_html_raw)
-        assert msg.body.plain_text is None
 
 
 # ---------------------------------------------------------------------------
@@ -145,42 +94,26 @@ class TestSimpleHtmlEmail:
 class TestMultipartAlternative:
     """Parsing multipart/alternative: both text and HTML parts extracted."""
 
-    def test_message_id(self, parser: GmailParser, multipart_alt_raw: dict[str, Any]) -> None:
-        msg = parser.parse(multipart_alt_raw)
-        assert msg.message_id == "msg_multipart_alt"
-
-    def test_thread_id(self, parser: GmailParser, multipart_alt_raw: dict[str, Any]) -> None:
-        msg = parser.parse(multipart_alt_raw)
-        assert msg.thread_id == "thread_003"
-
-    def test_label_ids(self, parser: GmailParser, multipart_alt_raw: dict[str, Any]) -> None:
-        msg = parser.parse(multipart_alt_raw)
-        assert msg.label_ids == ("INBOX", "IMPORTANT")
-
-    def test_subject(self, parser: GmailParser, multipart_alt_raw: dict[str, Any]) -> None:
-        msg = parser.parse(multipart_alt_raw)
-        assert msg.header.subject == "Multipart Alternative Email"
-
-    def test_plain_text_extracted(
-        self, parser: GmailParser, multipart_alt_raw: dict[str, Any]
-    ) -> None:
-        msg = parser.parse(multipart_alt_raw)
-        assert msg.body.plain_text == "This is the plain text version of the email.\n\nBest regards"
-
-    def test_html_extracted(self, parser: GmailParser, multipart_alt_raw: dict[str, Any]) -> None:
-        msg = parser.parse(multipart_alt_raw)
-        expected_html = (
-            "<html><body><p>This is the <b>HTML</b> version of the email.</p>"
-            "<p>Best regards</p></body></html>"
+    def test_full_parse(self, parser: GmailParser, multipart_alt_raw: dict[str, Any]) -> None:
+        assert asdict(parser.parse(multipart_alt_raw)) == _expected(
+            message_id="msg_multipart_alt",
+            thread_id="thread_003",
+            label_ids=("INBOX", "IMPORTANT"),
+            snippet="This email has both text and HTML versions.",
+            header={
+                "subject": "Multipart Alternative Email",
+                "sender": "both@example.com",
+                "to": "recipient@example.com",
+                "date": datetime(2024, 1, 17, 9, 15, 0, tzinfo=UTC),
+            },
+            body={
+                "plain_text": "This is the plain text version of the email.\n\nBest regards",
+                "html": (
+                    "<html><body><p>This is the <b>HTML</b> version of the email.</p>"
+                    "<p>Best regards</p></body></html>"
+                ),
+            },
         )
-        assert msg.body.html == expected_html
-
-    def test_both_bodies_present(
-        self, parser: GmailParser, multipart_alt_raw: dict[str, Any]
-    ) -> None:
-        msg = parser.parse(multipart_alt_raw)
-        assert msg.body.plain_text is not None
-        assert msg.body.html is not None
 
 
 # ---------------------------------------------------------------------------
@@ -191,39 +124,78 @@ class TestMultipartAlternative:
 class TestMultipartMixedWithAttachment:
     """Parsing multipart/mixed: attachment skipped, body parts extracted."""
 
-    def test_message_id(self, parser: GmailParser, multipart_mixed_raw: dict[str, Any]) -> None:
-        msg = parser.parse(multipart_mixed_raw)
-        assert msg.message_id == "msg_multipart_mixed"
-
-    def test_subject(self, parser: GmailParser, multipart_mixed_raw: dict[str, Any]) -> None:
-        msg = parser.parse(multipart_mixed_raw)
-        assert msg.header.subject == "Email With Attachment"
-
-    def test_plain_text_extracted(
-        self, parser: GmailParser, multipart_mixed_raw: dict[str, Any]
-    ) -> None:
-        msg = parser.parse(multipart_mixed_raw)
-        assert msg.body.plain_text == "Please find the attached document."
-
-    def test_html_extracted(self, parser: GmailParser, multipart_mixed_raw: dict[str, Any]) -> None:
-        msg = parser.parse(multipart_mixed_raw)
-        expected_html = "<html><body><p>Please find the <b>attached</b> document.</p></body></html>"
-        assert msg.body.html == expected_html
-
-    def test_attachment_not_in_body(
-        self, parser: GmailParser, multipart_mixed_raw: dict[str, Any]
-    ) -> None:
-        """The PDF attachment should be silently skipped."""
-        msg = parser.parse(multipart_mixed_raw)
-        assert "pdf" not in (msg.body.plain_text or "").lower()
-        assert "attachmentId" not in (msg.body.html or "")
-
-    def test_both_bodies_present(
-        self, parser: GmailParser, multipart_mixed_raw: dict[str, Any]
-    ) -> None:
-        msg = parser.parse(multipart_mixed_raw)
-        assert msg.body.plain_text is not None
-        assert msg.body.html is not None
+    def test_full_parse(self, parser: GmailParser, multipart_mixed_raw: dict[str, Any]) -> None:
+        # Exact body equality also proves the PDF attachment part was skipped
+        assert asdict(parser.parse(multipart_mixed_raw)) == _expected(
+            message_id="msg_multipart_mixed",
+            thread_id="thread_004",
+            label_ids=("INBOX",),
+            snippet="Email with attachment.",
+            header={
+                "subject": "Email With Attachment",
+                "sender": "files@example.com",
+                "to": "recipient@example.com",
+                "date": datetime(2024, 1, 18, 16, 45, 0, tzinfo=timezone(timedelta(hours=-8))),
+            },
+            body={
+                "plain_text": "Please find the attached document.",
+                "html": (
+                    "<html><body><p>Please find the <b>attached</b> document.</p></body></html>"
+                ),
+            },
+        )
+
+
+class TestNestedMultipart:
+    """Deeply nested trees: first text/plain and text/html in document order win."""
+
+    @staticmethod
+    def _text_part(mime_type: str, text: str) -> dict[str, Any]:
+        data = base64.urlsafe_b64encode(text.encode()).decode().rstrip("=")
+        return {"mimeType": mime_type, "body": {"data": data}}
+
+    def test_first_parts_win_and_walk_stops_early(self, parser: GmailParser) -> None:
+        raw = {
+            "id": "msg_nested",
+            "payload": {
+                "mimeType": "multipart/mixed",
+                "parts": [
+                    {
+                        "mimeType": "multipart/related",
+                        "parts": [
+                            {
+                                "mimeType": "multipart/alternative",
+                                "parts": [
+                                    self._text_part("text/plain", "first plain"),
+                                    self._text_part("text/html", "<p>first html</p>"),
+                                ],
+                            }
+                        ],
+                    },
+                    self._text_part("text/plain", "later plain"),
+                    self._text_part("text/html", "<p>later html</p>"),
+                ],
+            },
+        }
+        with patch.object(GmailParser, "_decode_body", wraps=GmailParser._decode_body) as decode:
+            msg = parser.parse(raw)
+
+        assert (msg.body.plain_text, msg.body.html) == ("first plain", "<p>first html</p>")
+        assert decode.call_count == 2
+
+    def test_mime_types_match_case_insensitively(self, parser: GmailParser) -> None:
+        raw = {
+            "id": "msg_upper_mime",
+            "payload": {
+                "mimeType": "Multipart/Alternative",
+                "parts": [
+                    self._text_part("TEXT/PLAIN", "plain"),
+                    self._text_part("Text/HTML", "<p>html</p>"),
+                ],
+            },
+        }
+        msg = parser.parse(raw)
+        assert (msg.body.plain_text, msg.body.html) == ("plain", "<p>html</p>")
 
 
 # ---------------------------------------------------------------------------
@@ -280,6 +252,12 @@ class TestBase64UrlDecoding:
         encoded = base64.urlsafe_b64encode(original.encode("utf-8")).decode().rstrip("=")
         assert parser._decode_body(encoded) == original
 
+    def test_bytes_input(self, parser: GmailParser) -> None:
+        """Callers holding ASCII bytes can skip the str round-trip."""
+        original = "Hello, bytes!"
+        encoded = base64.urlsafe_b64encode(original.encode()).rstrip(b"=")
+        assert parser._decode_body(encoded) == original
+
     def test_invalid_utf8_replaced(self, parser: GmailParser) -> None:
         """Invalid UTF-8 bytes should be replaced, not raise."""
         bad_bytes = b"\xff\xfe"
@@ -327,6 +305,29 @@ class TestDateParsing:
         result = GmailParser._parse_date("Mon, 15 Jan")
         assert result == datetime(1970, 1, 1)
 
+    def test_out_of_range_day_returns_epoch(self) -> None:
+        result = GmailParser._parse_date("Wed, 32 Jan 2024 10:00:00 +0000")
+        assert result == datetime(1970, 1, 1)
+
+    def test_missing_zone_is_naive(self) -> None:
+        result = GmailParser._parse_date("Mon, 15 Jan 2024 10:30:00")
+        assert result == datetime(2024, 1, 15, 10, 30, 0)
+        assert result.tzinfo is None
+
+    def test_negative_zero_offset_is_naive(self) -> None:
+        """-0000 means "local zone unknown", same as parsedate_to_datetime."""
+        result = GmailParser._parse_date("Mon, 15 Jan 2024 10:30:00 -0000")
+        assert result == datetime(2024, 1, 15, 10, 30, 0)
+        assert result.tzinfo is None
+
+    def test_fallbacks_share_one_epoch_instance(self) -> None:
+        assert GmailParser._parse_date("") is GmailParser._parse_date("still-not-a-date")
+
+    def test_repeated_date_is_cached(self) -> None:
+        date_str = "Wed, 17 Jan 2024 08:15:00 +0100"
+        first = GmailParser._parse_date(date_str)
+        assert GmailParser._parse_date(date_str) is first
+
 
 # ---------------------------------------------------------------------------
 # 7. Missing headers handling
@@ -593,3 +594,95 @@ class TestHeaderCaseInsensitivity:
         msg = parser.parse(raw)
         assert msg.header.subject == "Upper Case"
         assert msg.header.sender == "upper@example.com"
+
+    def test_first_duplicate_wins_and_scan_stops(self, parser: GmailParser) -> None:
+        headers: list[Any] = [
+            {"name": "Subject", "value": "First"},
+            {"name": "From", "value": "from@example.com"},
+            {"name": "To", "value": "to@example.com"},
+            {"name": "subject", "value": "Second"},
+            {"name": "Date", "value": "Mon, 15 Jan 2024 10:30:00 +0000"},
+            {"name": "Cc", "value": "cc@example.com"},
+            {"name": "Message-ID", "value": "<id@example.com>"},
+            None,  # never reached: all wanted headers are already indexed
+        ]
+        raw = {"id": "msg_dup", "payload": {"mimeType": "text/plain", "headers": headers}}
+        msg = parser.parse(raw)
+        assert msg.header.subject == "First"
+        assert msg.header.message_id_header == "<id@example.com>"
+
+
+# ---------------------------------------------------------------------------
+# Raw RFC 822 messages (format=raw)
+# ---------------------------------------------------------------------------
+
+_RAW_RFC822 = (
+    b"From: sender@example.com\r\n"
+    b"To: recipient@example.com\r\n"
+    b"Cc: cc@example.com\r\n"
+    b"Subject: Raw Email\r\n"
+    b"Date: Mon, 15 Jan 2024 10:30:00 -0500\r\n"
+    b"Message-ID: <raw001@example.com>\r\n"
+    b"MIME-Version: 1.0\r\n"
+    b'Content-Type: multipart/mixed; boundary="outer"\r\n'
+    b"\r\n"
+    b"--outer\r\n"
+    b'Content-Type: multipart/alternative; boundary="inner"\r\n'
+    b"\r\n"
+    b"--inner\r\n"
+    b"Content-Type: text/plain; charset=utf-8\r\n"
+    b"\r\n"
+    b"Plain body\r\n"
+    b"--inner\r\n"
+    b"Content-Type: text/html; charset=utf-8\r\n"
+    b"\r\n"
+    b"<p>HTML body</p>\r\n"
+    b"--inner--\r\n"
+    b"--outer\r\n"
+    b"Content-Type: application/pdf\r\n"
+    b'Content-Disposition: attachment; filename="report.pdf"\r\n'
+    b"Content-Transfer-Encoding: base64\r\n"
+    b"\r\n"
+    b"JVBERi0xLjQK\r\n"
+    b"--outer--\r\n"
+)
+
+
+class TestRawFormat:
+    """Messages fetched with format=raw carry the whole RFC 822 blob in ``raw``."""
+
+    @pytest.fixture(params=["fast_mail_parser", "stdlib"])
+    def raw_parser(
+        self, request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch
+    ) -> GmailParser:
+        """GmailParser on each backend; stdlib is the fallback without fast_mail_parser."""
+        if request.param == "fast_mail_parser":
+            pytest.importorskip("fast_mail_parser")
+        else:
+            monkeypatch.setattr(parser_module, "_fast_parse_email", None)
+        return GmailParser()
+
+    def test_parses_headers_and_body(self, raw_parser: GmailParser) -> None:
+        raw = {
+            "id": "msg_raw",
+            "threadId": "thread_raw",
+            "labelIds": ["INBOX"],
+            "raw": base64.urlsafe_b64encode(_RAW_RFC822).decode().rstrip("="),
+        }
+        msg = raw_parser.parse(raw)
+        assert (msg.message_id, msg.thread_id, msg.label_ids) == (
+            "msg_raw",
+            "thread_raw",
+            ("INBOX",),
+        )
+        assert msg.header.subject == "Raw Email"
+        assert msg.header.sender == "sender@example.com"
+        assert msg.header.to == "recipient@example.com"
+        assert msg.header.cc == "cc@example.com"
+        assert msg.header.message_id_header == "<raw001@example.com>"
+        assert msg.header.date == datetime(
+            2024, 1, 15, 10, 30, 0, tzinfo=timezone(timedelta(hours=-5))
+        )
+        assert msg.body.plain_text.strip() == "Plain body"
+        assert msg.body.html.strip() == "<p>HTML body</p>"
+        assert "JVBERi0" not in msg.body.plain_text
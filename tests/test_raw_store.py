@@ -3,16 +3,24 @@
 from __future__ import annotations
 
 from pathlib import Path
+from unittest.mock import patch
+
+import pytest
 
 from gmail_ingestor.core.models import EmailBody
 from gmail_ingestor.storage.raw_store import RawEmailStore
 
 
+@pytest.fixture
+def store(tmp_output_dir: Path) -> RawEmailStore:
+    """RawEmailStore writing into the per-test output directory."""
+    return RawEmailStore(tmp_output_dir)
+
+
 class TestStoreTextAndHtml:
     """store() with both plain_text and html creates two files."""
 
-    def test_creates_two_files(self, tmp_output_dir: Path) -> None:
-        store = RawEmailStore(tmp_output_dir)
+    def test_creates_two_files(self, store: RawEmailStore) -> None:
         body = EmailBody(plain_text="Hello plain", html="<p>Hello html</p>")
         result = store.store("msg001", body)
 
@@ -21,58 +29,57 @@ class TestStoreTextAndHtml:
         assert result["text"].exists()
         assert result["html"].exists()
 
-    def test_text_file_named_correctly(self, tmp_output_dir: Path) -> None:
-        store = RawEmailStore(tmp_output_dir)
+    def test_text_file_named_correctly(self, store: RawEmailStore) -> None:
         body = EmailBody(plain_text="text", html="<p>html</p>")
         result = store.store("msg001", body)
 
         assert result["text"].name == "msg001.txt"
 
-    def test_html_file_named_correctly(self, tmp_output_dir: Path) -> None:
-        store = RawEmailStore(tmp_output_dir)
+    def test_html_file_named_correctly(self, store: RawEmailStore) -> None:
         body = EmailBody(plain_text="text", html="<p>html</p>")
         result = store.store("msg001", body)
 
         assert result["html"].name == "msg001.html"
 
-    def test_text_content_preserved(self, tmp_output_dir: Path) -> None:
-        store = RawEmailStore(tmp_output_dir)
+    def test_text_content_preserved(self, store: RawEmailStore) -> None:
         plain = "Line one\nLine two\nSpecial chars: <>&\u00e9"
         body = EmailBody(plain_text=plain, html="<p>irrelevant</p>")
         result = store.store("msg_text", body)
 
         assert result["text"].read_text(encoding="utf-8") == plain
 
-    def test_html_content_preserved(self, tmp_output_dir: Path) -> None:
-        store = RawEmailStore(tmp_output_dir)
+    def test_html_content_preserved(self, store: RawEmailStore) -> None:
         html = "<html><body><p>Hello <b>world</b></p></body></html>"
         body = EmailBody(plain_text="irrelevant", html=html)
         result = store.store("msg_html", body)
 
         assert result["html"].read_text(encoding="utf-8") == html
 
+    def test_restore_truncates_previous_content(self, store: RawEmailStore) -> None:
+        store.store("msg_again", EmailBody(plain_text="a much longer first body"))
+        result = store.store("msg_again", EmailBody(plain_text="short"))
+
+        assert result["text"].read_bytes() == b"short"
+
 
 class TestStoreTextOnly:
     """store() with only plain_text creates one .txt file."""
 
-    def test_creates_only_text_file(self, tmp_output_dir: Path) -> None:
-        store = RawEmailStore(tmp_output_dir)
+    def test_creates_only_text_file(self, store: RawEmailStore) -> None:
         body = EmailBody(plain_text="Only text content", html=None)
         result = store.store("msg_text_only", body)
 
         assert "text" in result
         assert "html" not in result
 
-    def test_text_file_exists(self, tmp_output_dir: Path) -> None:
-        store = RawEmailStore(tmp_output_dir)
+    def test_text_file_exists(self, store: RawEmailStore) -> None:
         body = EmailBody(plain_text="Only text", html=None)
         result = store.store("msg_text_only", body)
 
         assert result["text"].exists()
         assert result["text"].name == "msg_text_only.txt"
 
-    def test_no_html_file_created(self, tmp_output_dir: Path) -> None:
-        store = RawEmailStore(tmp_output_dir)
+    def test_no_html_file_created(self, store: RawEmailStore, tmp_output_dir: Path) -> None:
         body = EmailBody(plain_text="text only", html=None)
         store.store("msg_text_only", body)
 
@@ -83,24 +90,21 @@ class TestStoreTextOnly:
 class TestStoreHtmlOnly:
     """store() with only html creates one .html file."""
 
-    def test_creates_only_html_file(self, tmp_output_dir: Path) -> None:
-        store = RawEmailStore(tmp_output_dir)
+    def test_creates_only_html_file(self, store: RawEmailStore) -> None:
         body = EmailBody(plain_text=None, html="<p>HTML only</p>")
         result = store.store("msg_html_only", body)
 
         assert "html" in result
         assert "text" not in result
 
-    def test_html_file_exists(self, tmp_output_dir: Path) -> None:
-        store = RawEmailStore(tmp_output_dir)
+    def test_html_file_exists(self, store: RawEmailStore) -> None:
         body = EmailBody(plain_text=None, html="<p>html</p>")
         result = store.store("msg_html_only", body)
 
         assert result["html"].exists()
         assert result["html"].name == "msg_html_only.html"
 
-    def test_no_text_file_created(self, tmp_output_dir: Path) -> None:
-        store = RawEmailStore(tmp_output_dir)
+    def test_no_text_file_created(self, store: RawEmailStore, tmp_output_dir: Path) -> None:
         body = EmailBody(plain_text=None, html="<p>html</p>")
         store.store("msg_html_only", body)
 
@@ -111,15 +115,13 @@ class TestStoreHtmlOnly:
 class TestStoreEmptyBody:
     """store() with both fields as None returns empty dict."""
 
-    def test_returns_empty_dict(self, tmp_output_dir: Path) -> None:
-        store = RawEmailStore(tmp_output_dir)
+    def test_returns_empty_dict(self, store: RawEmailStore) -> None:
         body = EmailBody(plain_text=None, html=None)
         result = store.store("msg_empty", body)
 
         assert result == {}
 
-    def test_no_files_created(self, tmp_output_dir: Path) -> None:
-        store = RawEmailStore(tmp_output_dir)
+    def test_no_files_created(self, store: RawEmailStore, tmp_output_dir: Path) -> None:
         body = EmailBody(plain_text=None, html=None)
         store.store("msg_empty", body)
 
@@ -130,16 +132,14 @@ class TestStoreEmptyBody:
 class TestStoreReturnsPaths:
     """store() returns a dict mapping 'text'/'html' to Path objects."""
 
-    def test_paths_are_absolute(self, tmp_output_dir: Path) -> None:
-        store = RawEmailStore(tmp_output_dir)
+    def test_paths_are_absolute(self, store: RawEmailStore) -> None:
         body = EmailBody(plain_text="text", html="<p>html</p>")
         result = store.store("msg_abs", body)
 
         assert result["text"].is_absolute()
         assert result["html"].is_absolute()
 
-    def test_paths_are_inside_raw_dir(self, tmp_output_dir: Path) -> None:
-        store = RawEmailStore(tmp_output_dir)
+    def test_paths_are_inside_raw_dir(self, store: RawEmailStore, tmp_output_dir: Path) -> None:
         body = EmailBody(plain_text="text", html="<p>html</p>")
         result = store.store("msg_dir", body)
 
@@ -160,3 +160,29 @@ class TestStoreCreatesDirectory:
         body = EmailBody(plain_text="hello", html=None)
         result = store.store("msg1", body)
         assert result["text"].exists()
+
+    def test_store_does_not_mkdir(self, store: RawEmailStore) -> None:
+        """The directory is created once in __init__, never per store() call."""
+        with patch.object(Path, "mkdir") as mkdir, patch("os.makedirs") as makedirs:
+            store.store("msg_no_mkdir", EmailBody(plain_text="text", html="<p>html</p>"))
+
+        mkdir.assert_not_called()
+        makedirs.assert_not_called()
+
+
+class TestStoreMany:
+    """store_many() saves several bodies and returns per-message results."""
+
+    def test_stores_every_message(self, store: RawEmailStore, tmp_output_dir: Path) -> None:
+        items = [
+            (f"msg{i}", EmailBody(plain_text=f"text {i}", html=f"<p>{i}</p>")) for i in range(20)
+        ]
+        results = store.store_many(items, max_workers=4)
+
+        assert list(results) == [message_id for message_id, _ in items]
+        assert results["msg7"]["text"].read_text(encoding="utf-8") == "text 7"
+        assert results["msg7"]["html"] == tmp_output_dir / "msg7.html"
+        assert len(list(tmp_output_dir.iterdir())) == 40
+
+    def test_empty_input(self, store: RawEmailStore) -> None:
+        assert store.store_many([]) == {}
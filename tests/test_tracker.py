@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
+import sqlite3
 from pathlib import Path
 
 import pytest
 
-from gmail_ingestor.storage.tracker import FetchTracker
+from gmail_ingestor.storage.tracker import _SELECT_IDS_BY_STATUS_SQL, _STOP_WRITER, FetchTracker
 
 
 class TestConnect:
@@ -38,8 +39,35 @@ class TestConnect:
         ).fetchall()
         tracker.close()
         index_names = {row["name"] for row in indexes}
-        assert "idx_messages_status" in index_names
+        assert "idx_messages_status_created" in index_names
         assert "idx_messages_label" in index_names
+        # Redundant with the (status, created_at, message_id) prefix
+        assert "idx_messages_status" not in index_names
+
+    def test_drops_obsolete_status_index(self, tmp_db_path: Path) -> None:
+        with FetchTracker(tmp_db_path) as tracker:
+            tracker.conn.execute("CREATE INDEX idx_messages_status ON messages(status)")
+        with FetchTracker(tmp_db_path) as tracker:
+            row = tracker.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'idx_messages_status'"
+            ).fetchone()
+        assert row is None
+
+    def test_creates_composite_index(self, tmp_db_path: Path) -> None:
+        with FetchTracker(tmp_db_path) as tracker:
+            plan = tracker.conn.execute(
+                f"EXPLAIN QUERY PLAN {_SELECT_IDS_BY_STATUS_SQL}", ("pending", 10, 0)
+            ).fetchall()
+        details = " ".join(row["detail"] for row in plan)
+        assert "COVERING INDEX idx_messages_status_created" in details
+        assert "TEMP B-TREE" not in details
+
+    def test_connect_enables_wal(self, tmp_db_path: Path) -> None:
+        with FetchTracker(tmp_db_path) as tracker:
+            journal_mode = tracker.conn.execute("PRAGMA journal_mode").fetchone()[0]
+            synchronous = tracker.conn.execute("PRAGMA synchronous").fetchone()[0]
+        assert journal_mode == "wal"
+        assert synchronous == 1  # NORMAL
 
     def test_creates_parent_directories(self, tmp_path: Path) -> None:
         nested = tmp_path / "a" / "b" / "test.db"
@@ -92,6 +120,70 @@ class TestBulkInsertPending:
             count = tracker.bulk_insert_pending([("m2", "t2"), ("m3", "t3")], "INBOX")
             assert count == 1
 
+    def test_counts_new_rows_across_chunks(self, tmp_db_path: Path) -> None:
+        """Multi-VALUES chunks sum their own changes; duplicates still skipped."""
+        with FetchTracker(tmp_db_path) as tracker:
+            assert tracker.bulk_insert_pending([(f"m{i}", "t") for i in range(450)], "A") == 450
+            assert tracker.bulk_insert_pending([(f"m{i}", "t") for i in range(500)], "B") == 50
+            assert tracker.count_by_status() == {"pending": 500}
+            row = tracker.get_message("m499")
+            assert row is not None
+            assert (row["thread_id"], row["label_id"]) == ("t", "B")
+
+    def test_large_batch_commits_once(self, tmp_db_path: Path) -> None:
+        stubs = [(f"m{i}", f"t{i}") for i in range(10_000)]
+        with FetchTracker(tmp_db_path) as tracker:
+            statements: list[str] = []
+            tracker.conn.set_trace_callback(statements.append)
+            inserted = tracker.bulk_insert_pending(stubs, "INBOX")
+            tracker.conn.set_trace_callback(None)
+            assert tracker.count_by_status() == {"pending": 10_000}
+        assert inserted == 10_000
+        assert statements.count("COMMIT") == 1
+
+    def test_drop_indexes_rebuilds_them(self, tmp_db_path: Path) -> None:
+        index_sql = "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'"
+        stubs = [(f"m{i}", f"t{i}") for i in range(10_000)]
+        with FetchTracker(tmp_db_path) as tracker:
+            before = {row["name"] for row in tracker.conn.execute(index_sql)}
+            statements: list[str] = []
+            tracker.conn.set_trace_callback(statements.append)
+            inserted = tracker.bulk_insert_pending(stubs, "INBOX", drop_indexes=True)
+            tracker.conn.set_trace_callback(None)
+            after = {row["name"] for row in tracker.conn.execute(index_sql)}
+            assert tracker.get_pending_ids(limit=1) == ["m0"]
+        assert inserted == 10_000
+        assert after == before
+        assert any(s.startswith("DROP INDEX") for s in statements)
+        assert statements.count("COMMIT") == 1
+
+    def test_drop_indexes_skipped_for_small_batch(self, tmp_db_path: Path) -> None:
+        with FetchTracker(tmp_db_path) as tracker:
+            statements: list[str] = []
+            tracker.conn.set_trace_callback(statements.append)
+            tracker.bulk_insert_pending([("m1", "t1")], "INBOX", drop_indexes=True)
+            tracker.conn.set_trace_callback(None)
+        assert not any(s.startswith("DROP INDEX") for s in statements)
+
+    def test_failed_batch_rolls_back(self, tmp_db_path: Path) -> None:
+        # The malformed stub lands in the second multi-VALUES chunk, after the
+        # first chunk's rows were already inserted inside the transaction
+        stubs = [(f"m{i}", "t") for i in range(250)] + [("bad", "t", "extra")]
+        with FetchTracker(tmp_db_path) as tracker:
+            with pytest.raises(sqlite3.ProgrammingError):
+                tracker.bulk_insert_pending(stubs, "INBOX")  # type: ignore[arg-type]
+            assert not tracker.conn.in_transaction
+            assert tracker.count_by_status() == {}
+
+    def test_original_error_survives_prior_rollback(self, tmp_db_path: Path) -> None:
+        """If the transaction is already gone, _tx re-raises the original error."""
+        with FetchTracker(tmp_db_path) as tracker:
+            with pytest.raises(KeyError, match="original"):
+                with tracker._tx() as conn:
+                    conn.execute("ROLLBACK")  # as SQLite does itself on some errors
+                    raise KeyError("original")
+            assert not tracker.conn.in_transaction
+
     def test_empty_list_returns_zero(self, tmp_db_path: Path) -> None:
         with FetchTracker(tmp_db_path) as tracker:
             count = tracker.bulk_insert_pending([], "INBOX")
@@ -149,6 +241,38 @@ class TestUpdateStatus:
             ).fetchone()
             assert row["markdown_path"] == "/out/msg1.md"
 
+    def test_omitted_fields_keep_stored_values(self, tmp_db_path: Path) -> None:
+        with FetchTracker(tmp_db_path) as tracker:
+            tracker.insert_pending("msg1", "t1", "INBOX")
+            tracker.update_status("msg1", "fetched", subject="Hello", raw_text_path="/t.txt")
+            tracker.update_status("msg1", "converted", markdown_path="/out/msg1.md")
+            row = tracker.get_message("msg1")
+            assert row is not None
+            assert (row["status"], row["subject"], row["raw_text_path"], row["markdown_path"]) == (
+                "converted",
+                "Hello",
+                "/t.txt",
+                "/out/msg1.md",
+            )
+
+    def test_update_status_many(self, tmp_db_path: Path) -> None:
+        with FetchTracker(tmp_db_path) as tracker:
+            tracker.bulk_insert_pending([("m1", "t1"), ("m2", "t2"), ("m3", "t3")], "INBOX")
+            tracker.update_status("m1", "fetched", subject="Kept")
+            count = tracker.update_status_many([("m1", "converted"), ("m2", "failed")])
+            assert count == 2
+            assert tracker.count_by_status() == {"converted": 1, "failed": 1, "pending": 1}
+            row = tracker.get_message("m1")
+            assert row is not None
+            assert row["subject"] == "Kept"
+
+    def test_update_status_many_rejects_invalid_status(self, tmp_db_path: Path) -> None:
+        with FetchTracker(tmp_db_path) as tracker:
+            tracker.insert_pending("m1", "t1", "INBOX")
+            with pytest.raises(ValueError, match="Invalid status"):
+                tracker.update_status_many([("m1", "fetched"), ("m1", "bogus")])
+            assert tracker.get_pending_ids() == ["m1"]
+
     def test_rejects_invalid_status(self, tmp_db_path: Path) -> None:
         with FetchTracker(tmp_db_path) as tracker:
             tracker.insert_pending("msg1", "t1", "INBOX")
@@ -252,6 +376,12 @@ class TestCountByStatus:
             assert counts["fetched"] == 1
             assert counts["failed"] == 1
 
+    def test_leaves_connection_row_factory(self, tmp_db_path: Path) -> None:
+        with FetchTracker(tmp_db_path) as tracker:
+            tracker.insert_pending("m1", "t1", "INBOX")
+            assert tracker.count_by_status() == {"pending": 1}
+            assert tracker.get_message("m1") is not None  # still sqlite3.Row-backed
+
     def test_empty_database(self, tmp_db_path: Path) -> None:
         with FetchTracker(tmp_db_path) as tracker:
             counts = tracker.count_by_status()
@@ -359,11 +489,98 @@ class TestRetryFailed:
             ).fetchone()
             assert row["status"] == "fetched"
 
+    def test_resets_large_batch(self, tmp_db_path: Path) -> None:
+        ids = [f"m{i}" for i in range(1000)]
+        with FetchTracker(tmp_db_path) as tracker:
+            tracker.bulk_insert_pending([(msg_id, "t") for msg_id in ids], "INBOX")
+            tracker.update_status_many([(msg_id, "failed") for msg_id in ids])
+            assert tracker.retry_failed() == 1000
+            assert tracker.count_by_status() == {"pending": 1000}
+
     def test_returns_zero_when_no_failed(self, tmp_db_path: Path) -> None:
         with FetchTracker(tmp_db_path) as tracker:
             assert tracker.retry_failed() == 0
 
 
+class TestAsyncWriter:
+    """update_status_async queues writes for a background writer thread."""
+
+    def test_flush_commits_queued_updates(self, tmp_db_path: Path) -> None:
+        ids = [f"m{i}" for i in range(1200)]
+        with FetchTracker(tmp_db_path) as tracker:
+            tracker.bulk_insert_pending([(msg_id, "t") for msg_id in ids], "INBOX")
+            tracker.start_async_writer()
+            for msg_id in ids:
+                tracker.update_status_async(msg_id, "fetched", subject=f"s-{msg_id}")
+            tracker.flush()
+            assert tracker.count_by_status() == {"fetched": 1200}
+            row = tracker.get_message("m7")
+            assert row is not None
+            assert row["subject"] == "s-m7"
+
+    def test_close_flushes_and_stops_writer(self, tmp_db_path: Path) -> None:
+        tracker = FetchTracker(tmp_db_path)
+        with tracker:
+            tracker.insert_pending("m1", "t1", "INBOX")
+            tracker.start_async_writer()
+            writer_thread = tracker._writer_thread
+            tracker.update_status_async("m1", "failed", error_message="boom")
+        assert writer_thread is not None and not writer_thread.is_alive()
+
+        with FetchTracker(tmp_db_path) as reopened:
+            row = reopened.get_message("m1")
+        assert row is not None
+        assert (row["status"], row["error_message"]) == ("failed", "boom")
+
+    @pytest.mark.parametrize(
+        ("bad_item", "expected_error"),
+        [
+            pytest.param(("UPDATE no_such_table SET x = 1", ()), sqlite3.Error, id="sqlite_error"),
+            pytest.param(("UPDATE messages SET status = 'fetched'",), ValueError, id="malformed"),
+        ],
+    )
+    def test_flush_raises_failed_batch_error(
+        self, tmp_db_path: Path, bad_item: tuple[object, ...], expected_error: type[Exception]
+    ) -> None:
+        with FetchTracker(tmp_db_path) as tracker:
+            tracker.insert_pending("m1", "t1", "INBOX")
+            tracker.start_async_writer()
+            assert tracker._writer_queue is not None
+            tracker._writer_queue.put(bad_item)
+            with pytest.raises(expected_error):
+                tracker.flush()
+
+            # The writer survives the failed batch and keeps committing
+            tracker.update_status_async("m1", "fetched")
+            tracker.flush()
+            assert tracker.count_by_status() == {"fetched": 1}
+
+    def test_close_raises_when_writer_thread_is_gone(self, tmp_db_path: Path) -> None:
+        tracker = FetchTracker(tmp_db_path)
+        tracker.connect()
+        tracker.start_async_writer()
+        assert tracker._writer_queue is not None and tracker._writer_thread is not None
+        tracker._writer_queue.put(_STOP_WRITER)
+        tracker._writer_thread.join()
+
+        with pytest.raises(RuntimeError, match="writer thread exited"):
+            tracker.close()
+        assert tracker._writer_thread is None
+        assert tracker._conn is None
+
+    def test_rejects_invalid_status_before_queueing(self, tmp_db_path: Path) -> None:
+        with FetchTracker(tmp_db_path) as tracker:
+            tracker.start_async_writer()
+            with pytest.raises(ValueError, match="Invalid status"):
+                tracker.update_status_async("m1", "bogus")
+
+    def test_requires_started_writer(self, tmp_db_path: Path) -> None:
+        with FetchTracker(tmp_db_path) as tracker:
+            with pytest.raises(RuntimeError, match="start_async_writer"):
+                tracker.update_status_async("m1", "fetched")
+            tracker.flush()  # no-op without a writer
+
+
 class TestContextManager:
     """FetchTracker works as a context manager for connect/close lifecycle."""
 
@@ -380,6 +597,13 @@ class TestContextManager:
             assert tracker._conn is not None
         assert tracker._conn is None
 
+    def test_close_runs_pragma_optimize(self, tmp_db_path: Path) -> None:
+        tracker = FetchTracker(tmp_db_path)
+        statements: list[str] = []
+        with tracker:
+            tracker.conn.set_trace_callback(statements.append)
+        assert "PRAGMA optimize" in statements
+
     def test_conn_property_raises_when_not_connected(self, tmp_db_path: Path) -> None:
         tracker = FetchTracker(tmp_db_path)
         with pytest.raises(RuntimeError, match="not connected"):
@@ -2,12 +2,19 @@
 
 from __future__ import annotations
 
+import os
+import stat
+import unicodedata
+from dataclasses import replace
 from datetime import datetime
 from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
 
 import pytest
 
 from gmail_ingestor.core.models import ConvertedEmail, EmailHeader
+from gmail_ingestor.storage import writer as writer_module
 from gmail_ingestor.storage.writer import MarkdownWriter
 
 
@@ -57,6 +64,38 @@ class TestWrite:
         content = path.read_text(encoding="utf-8")
         assert content == "# Weekly Newsletter\n\nHello, world!"
 
+    def test_rewrite_truncates_previous_content(
+        self, tmp_output_dir: Path, sample_converted_email: ConvertedEmail
+    ) -> None:
+        writer = MarkdownWriter(tmp_output_dir)
+        writer.write(sample_converted_email)
+        path = writer.write(replace(sample_converted_email, markdown="# Short"))
+
+        assert path.read_bytes() == b"# Short"
+
+    def test_large_markdown_written_intact(
+        self, tmp_output_dir: Path, sample_converted_email: ConvertedEmail
+    ) -> None:
+        """Payloads beyond 64 KiB go through the same unbuffered os.write loop."""
+        markdown = "# Big\n\n" + "caf\u00e9 " * 40_000
+        writer = MarkdownWriter(tmp_output_dir)
+        path = writer.write(replace(sample_converted_email, markdown=markdown))
+
+        assert path.read_bytes() == markdown.encode("utf-8")
+
+    @pytest.mark.skipif(os.name != "posix", reason="umask applies to POSIX modes")
+    def test_file_mode_follows_umask(
+        self, tmp_output_dir: Path, sample_converted_email: ConvertedEmail
+    ) -> None:
+        """New files get 0o666 narrowed by the umask, like Path.write_text."""
+        old_umask = os.umask(0o002)
+        try:
+            path = MarkdownWriter(tmp_output_dir).write(sample_converted_email)
+        finally:
+            os.umask(old_umask)
+
+        assert stat.S_IMODE(path.stat().st_mode) == 0o664
+
     def test_file_inside_output_dir(
         self, tmp_output_dir: Path, sample_converted_email: ConvertedEmail
     ) -> None:
@@ -209,6 +248,26 @@ class TestSlugify:
         result = MarkdownWriter._slugify("hello_world")
         assert "hello_world" in result
 
+    def test_latin_accents_skip_nfkd(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Latin-1/Extended-A accents fold via the translate table alone."""
+
+        def _fail(*_: object) -> str:
+            raise AssertionError("unicodedata.normalize should not be reached")
+
+        monkeypatch.setattr(writer_module, "unicodedata", SimpleNamespace(normalize=_fail))
+        subject = "Cr\u00e8me Br\u00fbl\u00e9e \u00c0 \u0141\u00f3d\u017a"
+        assert MarkdownWriter._slugify(subject) == "creme-brulee-a-odz"
+
+    def test_translate_table_matches_nfkd(self) -> None:
+        text = "".join(map(chr, range(0xA0, 0x180)))
+        folded = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+        assert text.translate(writer_module._ACCENT_MAP) == folded
+
+    def test_mixed_separator_runs_collapse(self) -> None:
+        assert MarkdownWriter._slugify("Q3 - results -- final!? \t draft") == (
+            "q3-results-final-draft"
+        )
+
 
 class TestWriterCreatesDirectory:
     """MarkdownWriter constructor creates output directory if needed."""
@@ -219,3 +278,14 @@ class TestWriterCreatesDirectory:
 
         assert nested.exists()
         assert nested.is_dir()
+
+    def test_write_does_not_mkdir(
+        self, tmp_output_dir: Path, sample_converted_email: ConvertedEmail
+    ) -> None:
+        """The directory is created once in __init__, never per write() call."""
+        writer = MarkdownWriter(tmp_output_dir)
+        with patch.object(Path, "mkdir") as mkdir, patch("os.makedirs") as makedirs:
+            writer.write(sample_converted_email)
+
+        mkdir.assert_not_called()
+        makedirs.assert_not_called()